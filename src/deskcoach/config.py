@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import copy
 import logging
-from types import SimpleNamespace
+import os
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 try:
     import tomllib  # Python 3.11+
@@ -39,10 +41,67 @@ snooze_minutes = 30
 lock_reset_threshold_minutes = 5
 log_level = "WARNING"
 """
+# Parsed once at import; copy before handing out so callers can't mutate the shared defaults
+_DEFAULT_CONFIG_PARSED: Dict[str, Any] = tomllib.loads(_DEFAULT_CONFIG_TOML.decode("utf-8"))
 
 
-def _read_toml_bytes(data_bytes: bytes) -> Dict[str, Any]:
-    return tomllib.loads(data_bytes.decode("utf-8"))
+@dataclass(slots=True)
+class AppConfig:
+    """Values of the [app] table.
+
+    Not frozen: the settings dialog applies saved values in place so that
+    components holding a reference see them without a restart.
+    """
+
+    base_url: str = "http://localhost"
+    poll_minutes: float = 5.0
+    start_of_day_hour: int = 4
+    stand_threshold_mm: int = 900
+    stand_goal_mm: int = 240
+    remind_after_minutes: int = 45
+    remind_repeat_minutes: int = 5
+    snooze_minutes: int = 30
+    lock_reset_threshold_minutes: int = 5
+    standing_check_after_minutes: int = 30
+    standing_check_repeat_minutes: int = 30
+    log_level: str = "INFO"
+    # Poll every poll_minutes * factor while the main window is hidden; 1 = uniform sampling
+    background_poll_factor: int = 1
+
+
+@dataclass(slots=True)
+class Config:
+    app: AppConfig = field(default_factory=AppConfig)
+
+
+# (key, coercion, default) per AppConfig field, in declaration order
+_COERCE = {"str": str, "int": int, "float": float}
+_SPEC: tuple[tuple[str, Callable[[Any], Any], Any], ...] = tuple(
+    (f.name, _COERCE[f.type], f.default) for f in fields(AppConfig)
+)
+
+# Seed files for a fresh data folder, resolved once at import:
+# 1) project root (development runs), 2) package resources (src/deskcoach/resources)
+_MODULE_FILE = Path(__file__).resolve()
+try:
+    _SEED_CANDIDATES: tuple[Path, ...] = (
+        _MODULE_FILE.parents[2] / CONFIG_FILENAME,
+        _MODULE_FILE.parents[1] / "resources" / CONFIG_FILENAME,
+    )
+except IndexError:  # pragma: no cover - unusual bundle layouts
+    _SEED_CANDIDATES = (_MODULE_FILE.parent / "resources" / CONFIG_FILENAME,)
+
+# Parsed configs keyed by resolved file path -> (st_mtime_ns, st_size, config).
+# Entries are invalidated implicitly when the file's mtime or size changes.
+_CFG_CACHE: Dict[Path, Tuple[int, int, Config]] = {}
+
+
+def _try_stat(p: Path) -> Optional[os.stat_result]:
+    """Return p's stat result, or None if it doesn't exist."""
+    try:
+        return p.stat()
+    except FileNotFoundError:
+        return None
 
 
 def _load_from_path(p: Path) -> Dict[str, Any]:
@@ -50,29 +109,17 @@ def _load_from_path(p: Path) -> Dict[str, Any]:
         return tomllib.load(f)
 
 
-def _data_dir() -> Path:
+def get_data_dir() -> Path:
+    """Return the per-user data directory shared by the config file and the database (created if missing)."""
     dirs = PlatformDirs(appname=APP_NAME, appauthor=APP_AUTHOR, roaming=False)
     p = Path(dirs.user_data_dir)
     p.mkdir(parents=True, exist_ok=True)
     return p
 
 
-def _candidate_config_paths() -> list[Path]:
+def _candidate_config_paths() -> tuple[Path, ...]:
     """Return likely config paths in decreasing priority for default lookup (excluding data folder)."""
-    candidates: list[Path] = []
-    # 1) Project root (development runs)
-    try:
-        dev_root = Path(__file__).resolve().parents[2]
-        candidates.append(dev_root / CONFIG_FILENAME)
-    except Exception:
-        pass
-    # 2) Package resources (src/deskcoach/resources)
-    try:
-        pkg_res_dir = Path(__file__).resolve().parents[1] / "resources"
-        candidates.append(pkg_res_dir / CONFIG_FILENAME)
-    except Exception:
-        pass
-    return candidates
+    return _SEED_CANDIDATES
 
 
 def _write_default_to(path: Path) -> None:
@@ -82,84 +129,71 @@ def _write_default_to(path: Path) -> None:
 
 def get_user_config_path() -> Path:
     """Return the path to the user-specific config.toml (creates data dir if missing)."""
-    return _data_dir() / CONFIG_FILENAME
+    return get_data_dir() / CONFIG_FILENAME
+
 
+def _build_config(data: Dict[str, Any]) -> Config:
+    # Minimal validation and defaults
+    app = data.get("app", {})
+    vals = {key: coerce(app.get(key, default)) for key, coerce, default in _SPEC}
+    vals["start_of_day_hour"] = min(23, max(0, vals["start_of_day_hour"]))
+    vals["log_level"] = vals["log_level"].upper()
+    vals["background_poll_factor"] = max(1, vals["background_poll_factor"])
+
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Loaded config: %s", ", ".join(f"{k}={v}" for k, v in vals.items()))
+    return Config(app=AppConfig(**vals))
 
-def load_config(path: Optional[Path | str] = None) -> SimpleNamespace:
-    """Load configuration into a SimpleNamespace.
+
+def load_config(path: Optional[Path | str] = None) -> Config:
+    """Load configuration into a Config (with the [app] table as `.app`).
 
     Behavior:
     - If an explicit `path` is provided and the file doesn't exist, raise FileNotFoundError (preserves tests).
     - If `path` is None, prefer the user data folder; if no config exists there, create it from defaults and load it. If that fails, fall back to embedded defaults.
     """
-    data: Dict[str, Any]
-
     if path is not None:
         cfg_path = Path(path)
-        if not cfg_path.exists():
+        st = _try_stat(cfg_path)
+        if st is None:
             raise FileNotFoundError(f"Config file not found at {cfg_path}")
-        data = _load_from_path(cfg_path)
     else:
         # Prefer data folder
-        data_dir = _data_dir()
-        user_cfg = data_dir / CONFIG_FILENAME
-        if user_cfg.exists():
-            data = _load_from_path(user_cfg)
-        else:
+        data_dir = get_data_dir()
+        cfg_path = data_dir / CONFIG_FILENAME
+        st = _try_stat(cfg_path)
+        if st is None:
             # Try additional candidates to seed from (e.g., project root or packaged resource)
             seeded = False
             for cand in _candidate_config_paths():
+                if not cand.is_file():
+                    continue
                 try:
-                    if cand.exists():
-                        user_cfg.write_bytes(Path(cand).read_bytes())
-                        log.info("Copied default config from %s to %s", cand, user_cfg)
-                        seeded = True
-                        break
-                except Exception:
+                    cfg_path.write_bytes(cand.read_bytes())
+                except OSError as e:
+                    log.debug("Could not copy default config from %s: %s", cand, e)
                     continue
+                log.info("Copied default config from %s to %s", cand, cfg_path)
+                seeded = True
+                break
             if not seeded:
                 # Write embedded default
-                _write_default_to(user_cfg)
-            # Load the now-present config
-            data = _load_from_path(user_cfg)
-
-    # Minimal validation and defaults
-    app = data.get("app", {})
-    base_url = str(app.get("base_url", "http://localhost"))
-    poll_minutes = float(app.get("poll_minutes", 5))
-    start_of_day_hour = int(app.get("start_of_day_hour", 4))
-    if start_of_day_hour < 0:
-        start_of_day_hour = 0
-    if start_of_day_hour > 23:
-        start_of_day_hour = 23
-    stand_threshold_mm = int(app.get("stand_threshold_mm", 900))
-    stand_goal_mm = int(app.get("stand_goal_mm", 240))
-    remind_after_minutes = int(app.get("remind_after_minutes", 45))
-    remind_repeat_minutes = int(app.get("remind_repeat_minutes", 5))
-    snooze_minutes = int(app.get("snooze_minutes", 30))
-    lock_reset_threshold_minutes = int(app.get("lock_reset_threshold_minutes", 5))
-    standing_check_after_minutes = int(app.get("standing_check_after_minutes", 30))
-    standing_check_repeat_minutes = int(app.get("standing_check_repeat_minutes", 30))
-    log_level = str(app.get("log_level", "INFO")).upper()
-
-    ns = SimpleNamespace(
-        app=SimpleNamespace(
-            base_url=base_url,
-            poll_minutes=poll_minutes,
-            start_of_day_hour=start_of_day_hour,
-            stand_threshold_mm=stand_threshold_mm,
-            stand_goal_mm=stand_goal_mm,
-            remind_after_minutes=remind_after_minutes,
-            remind_repeat_minutes=remind_repeat_minutes,
-            snooze_minutes=snooze_minutes,
-            lock_reset_threshold_minutes=lock_reset_threshold_minutes,
-            standing_check_after_minutes=standing_check_after_minutes,
-            standing_check_repeat_minutes=standing_check_repeat_minutes,
-            log_level=log_level,
-        )
-    )
-    log.debug(
-        "Loaded config: base_url=%s, poll_minutes=%s, start_of_day_hour=%s, stand_threshold_mm=%s, stand_goal_mm=%s, remind_after=%s, repeat=%s, snooze=%s, lock_reset_threshold_minutes=%s, stand_after=%s, stand_repeat=%s, log_level=%s",
-        base_url, poll_minutes, start_of_day_hour, stand_threshold_mm, stand_goal_mm, remind_after_minutes, remind_repeat_minutes, snooze_minutes, lock_reset_threshold_minutes, standing_check_after_minutes, standing_check_repeat_minutes, log_level,
-    )
-    return ns
+                try:
+                    _write_default_to(cfg_path)
+                except OSError as e:
+                    log.warning("Could not create %s (%s); using embedded defaults", cfg_path, e)
+                    return _build_config(copy.deepcopy(_DEFAULT_CONFIG_PARSED))
+            st = _try_stat(cfg_path)
+            if st is None:
+                return _build_config(copy.deepcopy(_DEFAULT_CONFIG_PARSED))
+
+    # The stat above doubles as the cache validator; abspath avoids resolve()'s extra lstat calls
+    key = Path(os.path.abspath(cfg_path))
+    cached = _CFG_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        # Hand out a copy: callers (e.g. the settings dialog) update the config in place
+        return copy.deepcopy(cached[2])
+
+    ns = _build_config(_load_from_path(key))
+    _CFG_CACHE[key] = (st.st_mtime_ns, st.st_size, ns)
+    return copy.deepcopy(ns)
@@ -1,6 +1,9 @@
 import sys
-import time
+import atexit
 import logging
+import functools
+import contextlib
+from dataclasses import fields
 from typing import Optional
 
 # Allow running as a script (python path/to/deskcoach/main.py) by adding src to sys.path
@@ -14,8 +17,8 @@ try:
 except Exception:
     pass
 
-from PyQt6.QtCore import QTimer
-from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QStyle, QMainWindow, QWidget, QVBoxLayout, QPushButton, QDialog, QFormLayout, QLineEdit, QDoubleSpinBox, QSpinBox, QCheckBox, QMessageBox, QHBoxLayout
+from PyQt6.QtCore import QTimer, Qt
+from PyQt6.QtWidgets import QApplication, QSystemTrayIcon, QMenu
 from PyQt6.QtGui import QIcon, QAction
 
 try:
@@ -24,34 +27,54 @@ except ImportError:
     from deskcoach.app import build_app
 
 try:
-    from .services import api_client, notifier  # when running as a package (python -m deskcoach.main)
-    from .models import store
+    from .models import store  # when running as a package (python -m deskcoach.main)
     from .config import load_config
-    from .services.session_watcher import SessionWatcher
-    from .services.reminder import ReminderEngine
 except ImportError:
-    from deskcoach.services import api_client, notifier  # absolute fallback
-    from deskcoach.models import store
+    from deskcoach.models import store  # absolute fallback
     from deskcoach.config import load_config
-    from deskcoach.services.session_watcher import SessionWatcher
-    from deskcoach.services.reminder import ReminderEngine
 
-# UI views are now defined in deskcoach.views
-try:
-    from .views import MainWindow, SettingsDialog
-except ImportError:
-    from deskcoach.views import MainWindow, SettingsDialog  # type: ignore
+# One formatter for console and file output. An explicit datefmt skips the
+# millisecond suffix; records don't need thread/process info.
+_LOG_FORMATTER = logging.Formatter(
+    "%(asctime)s %(levelname)s %(name)s: %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+)
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Services and views are imported inside main() when first needed so the tray
+# can appear before httpx, the session watcher and the widget modules load.
+
+# Keeps materialized resource files (e.g. extracted from a zip) alive until exit
+_RESOURCE_FILES = contextlib.ExitStack()
+atexit.register(_RESOURCE_FILES.close)
+# Preferred first: a 32px PNG for tray clarity
+_ICON_NAMES = ("icon_32px.png", "icon.ico")
+_ICON_PATH: Optional[str] = None  # "" once resolution found nothing
+
+
+def _icon_path() -> Optional[str]:
+    """Resolve the packaged icon to a real file path once (one probe per candidate)."""
+    global _ICON_PATH
+    if _ICON_PATH is None:
+        from importlib.resources import files, as_file
+        icons = files("deskcoach.resources.icons")
+        icon_res = next((res for res in (icons / n for n in _ICON_NAMES) if res.is_file()), None)
+        # QIcon reads the file lazily, so the path must outlive this call
+        _ICON_PATH = str(_RESOURCE_FILES.enter_context(as_file(icon_res))) if icon_res is not None else ""
+    return _ICON_PATH or None
 
+
+@functools.lru_cache(maxsize=1)
 def _load_app_icon() -> QIcon:
-    """Load app icon from packaged resources, with graceful fallbacks."""
+    """Load app icon from packaged resources, with graceful fallbacks.
+
+    Cached: the tray, the application and the main window share one QIcon.
+    """
     try:
-        from importlib.resources import files, as_file
-        # Prefer a 32px PNG for tray clarity
-        icon_res = files("deskcoach.resources.icons") / "icon_32px.png"
-        if not icon_res.is_file():
-            icon_res = files("deskcoach.resources.icons") / "icon.ico"
-        with as_file(icon_res) as p:
-            return QIcon(str(p))
+        path = _icon_path()
+        if path:
+            return QIcon(path)
     except Exception:
         pass
     # Last resort: a standard system icon
@@ -65,7 +88,24 @@ def _load_app_icon() -> QIcon:
     return QIcon()
 
 
-def create_tray_icon(app: QApplication) -> QSystemTrayIcon:
+_SNOOZE_TEXT = "Snooze {} min"
+
+# AppConfig fields the reminder engine copies at construction
+_REMINDER_FIELDS = frozenset({
+    "stand_threshold_mm",
+    "remind_after_minutes",
+    "remind_repeat_minutes",
+    "snooze_minutes",
+    "standing_check_after_minutes",
+    "standing_check_repeat_minutes",
+    "lock_reset_threshold_minutes",
+})
+
+
+def create_tray_icon(app: QApplication) -> Optional[QSystemTrayIcon]:
+    """Create the tray icon with its Close action, or return None if there is no system tray."""
+    if not QSystemTrayIcon.isSystemTrayAvailable():
+        return None
     icon: QIcon = _load_app_icon()
 
     tray = QSystemTrayIcon(icon, app)
@@ -100,12 +140,47 @@ def create_tray_icon(app: QApplication) -> QSystemTrayIcon:
     return tray
 
 
+_INSTANCE_SERVER_NAME = "deskcoach-singleton"
+
+
+def _claim_single_instance(log: logging.Logger):
+    """Return a listening QLocalServer, or None if another instance is already running.
+
+    A running instance is asked to show its window instead. If QtNetwork is not
+    available the guard is skipped and a dummy truthy object is returned.
+    """
+    try:
+        from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+    except Exception:
+        return object()
+    # Per-user name: on Windows local servers are named pipes visible to every session
+    try:
+        import getpass
+        name = f"{_INSTANCE_SERVER_NAME}-{getpass.getuser()}"
+    except Exception:
+        name = _INSTANCE_SERVER_NAME
+    sock = QLocalSocket()
+    sock.connectToServer(name)
+    if sock.waitForConnected(100):
+        sock.write(b"show")
+        sock.waitForBytesWritten(100)
+        sock.disconnectFromServer()
+        log.info("DeskCoach is already running; asked it to show its window")
+        return None
+    server = QLocalServer()
+    # Clears a stale socket file left by a crashed instance (no-op on Windows)
+    QLocalServer.removeServer(name)
+    if not server.listen(name):
+        log.warning("Single-instance guard unavailable: %s", server.errorString())
+    return server
+
+
 def main() -> int:
     # Basic logging to something (will refine after config/db known)
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
-    )
+    logging.basicConfig(level=logging.INFO)
+    for h in logging.getLogger().handlers:
+        if h.formatter is None or h.formatter._fmt == logging.BASIC_FORMAT:
+            h.setFormatter(_LOG_FORMATTER)
     log = logging.getLogger("deskcoach")
 
     ns = load_config()
@@ -116,6 +191,7 @@ def main() -> int:
     data_dir = db_path.parent
 
     # Configure file logging in the same folder as the database
+    file_handler: Optional[logging.Handler] = None
     try:
         logfile = data_dir / "deskcoach.log"
         root_logger = logging.getLogger()
@@ -123,22 +199,14 @@ def main() -> int:
         level_name = str(getattr(cfg, "log_level", "INFO")).upper()
         level = getattr(logging, level_name, logging.INFO)
         root_logger.setLevel(level)
-        # Avoid adding duplicate file handlers
-        has_file = False
-        for h in root_logger.handlers:
-            try:
-                if isinstance(h, logging.FileHandler) and getattr(h, "baseFilename", None):
-                    if str(h.baseFilename) == str(logfile):
-                        has_file = True
-                        break
-            except Exception:
-                continue
-        if not has_file:
-            fh = logging.FileHandler(str(logfile), encoding="utf-8")
-            fh.setLevel(level)
-            fmt = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
-            fh.setFormatter(fmt)
-            root_logger.addHandler(fh)
+        # Avoid adding a second file handler if main() runs again in this process
+        file_handler = next((h for h in root_logger.handlers if getattr(h, "_deskcoach", False)), None)
+        if file_handler is None:
+            file_handler = logging.FileHandler(str(logfile), encoding="utf-8")
+            file_handler._deskcoach = True  # type: ignore[attr-defined]
+            file_handler.setFormatter(_LOG_FORMATTER)
+            root_logger.addHandler(file_handler)
+        file_handler.setLevel(level)
         log.info("Logging to %s (level %s)", logfile, level_name)
     except Exception:
         pass
@@ -148,136 +216,314 @@ def main() -> int:
 
     # Build application with modern styling; pass theme from config if present
     app = build_app(theme=str(getattr(cfg, "theme", "auto")))
-    # Set application icon from resources
-    try:
-        app_icon = _load_app_icon()
-        app.setWindowIcon(app_icon)
-    except Exception:
-        pass
+    instance_server = _claim_single_instance(log)
+    if instance_server is None:
+        return 0
+    # Set application icon from resources (_load_app_icon never raises; worst case an empty QIcon)
+    app_icon = _load_app_icon()
+    app.setWindowIcon(app_icon)
     # Keep references so they're not garbage-collected
     tray = create_tray_icon(app)
-    main_window = MainWindow(ns)
-    try:
-        main_window.setWindowIcon(app_icon)
-    except Exception:
-        pass
     # Expose tray to notifier fallback
-    try:
-        notifier.tray = tray  # type: ignore[attr-defined]
-    except Exception:
-        pass
-
-    # Session watcher and reminder engine
-    watcher = SessionWatcher(emit_initial_event=True)
-    reminder_engine = ReminderEngine(cfg, watcher)
-
-
-    # Extend tray menu with actions
-    menu = tray.contextMenu()
+    if tray is not None:
+        try:
+            try:
+                from .services import notifier
+            except ImportError:
+                from deskcoach.services import notifier  # type: ignore
+            notifier.set_tray(tray)
+        except Exception:
+            pass
 
-    # App state to allow live updates from settings
+    # App state to allow live updates from settings. The main window, session
+    # watcher and reminder engine are created on first use / once the event loop runs.
     app_state = {
         "ns": ns,
         "cfg": cfg,
         "snooze_minutes": int(getattr(cfg, "snooze_minutes", 30)),
+        "main_window": None,
+        "watcher": None,
+        "reminder": None,
+        "file_handler": file_handler,
+        "unlocked": True,  # kept in sync with the session watcher's signals
     }
+    snooze_action: Optional[QAction] = None
+    # Values last applied to the running components; settings changes are diffed against it
+    app_state["applied"] = {f.name: getattr(cfg, f.name) for f in fields(cfg)}
+
+    def _on_settings_applied() -> None:
+        current_cfg = app_state["cfg"]
+        new = {f.name: getattr(current_cfg, f.name) for f in fields(current_cfg)}
+        old = app_state["applied"]
+        changed = {k for k, v in new.items() if old.get(k) != v}
+        app_state["applied"] = new
+        if not changed:
+            return
+        log.info("Applying changed settings: %s", ", ".join(sorted(changed)))
+        new_snooze = int(new["snooze_minutes"])
+        if new_snooze != app_state["snooze_minutes"]:
+            # Reuse the existing action; only its label depends on settings
+            app_state["snooze_minutes"] = new_snooze
+            if snooze_action is not None:
+                snooze_action.setText(_SNOOZE_TEXT.format(new_snooze))
+        if "log_level" in changed:
+            level = getattr(logging, str(new["log_level"]).upper(), logging.INFO)
+            logging.getLogger().setLevel(level)
+            if app_state["file_handler"] is not None:
+                app_state["file_handler"].setLevel(level)
+        engine = app_state["reminder"]
+        if engine is not None and changed & _REMINDER_FIELDS:
+            engine.update_config(current_cfg)
+        if changed & {"poll_minutes", "background_poll_factor"} and not app_state["poll_inflight"]:
+            # Don't wait out an old (possibly much longer) interval
+            _schedule_next_poll()
+
+    def _get_main_window():
+        win = app_state["main_window"]
+        if win is None:
+            try:
+                from .views import MainWindow
+            except ImportError:
+                from deskcoach.views import MainWindow  # type: ignore
+            win = MainWindow(ns)
+            win.setWindowIcon(app_icon)
+            if tray is None:
+                win.hide_on_close = False
+            win.visibility_changed.connect(_on_window_visibility)
+            win.settings_applied.connect(_on_settings_applied)
+            app_state["main_window"] = win
+        return win
 
-    # Open main window action
-    open_action = QAction("Open DeskCoach…", menu)
     def open_main_window():
-        main_window.show()
-        main_window.raise_()
-        main_window.activateWindow()
-    open_action.triggered.connect(open_main_window)
+        win = _get_main_window()
+        win.show()
+        win.raise_()
+        win.activateWindow()
 
-    # Open on tray single click or double-click
+    # Later launches connect to the instance server instead of starting a second tray/poller
     try:
-        def _on_tray_activated(reason):
-            try:
-                # Respond to left single click (Trigger) and double-click
-                if reason in (
-                    QSystemTrayIcon.ActivationReason.Trigger,
-                    QSystemTrayIcon.ActivationReason.DoubleClick,
-                ):
-                    open_main_window()
-            except Exception:
-                pass
-        tray.activated.connect(_on_tray_activated)
-    except Exception:
-        # If tray activation connection fails, ignore
-        pass
+        def _on_instance_connection():
+            conn = instance_server.nextPendingConnection()
+            while conn is not None:
+                conn.disconnected.connect(conn.deleteLater)
+                conn = instance_server.nextPendingConnection()
+            open_main_window()
+        instance_server.newConnection.connect(_on_instance_connection)
+    except AttributeError:
+        pass  # no QtNetwork: guard disabled
+
+    if tray is not None:
+        # Extend tray menu with actions
+        menu = tray.contextMenu()
+
+        # Open main window action
+        open_action = QAction("Open DeskCoach…", menu)
+        open_action.triggered.connect(open_main_window)
+
+        # Open on tray single click or double-click
+        try:
+            def _on_tray_activated(reason):
+                try:
+                    # Respond to left single click (Trigger) and double-click
+                    if reason in (
+                        QSystemTrayIcon.ActivationReason.Trigger,
+                        QSystemTrayIcon.ActivationReason.DoubleClick,
+                    ):
+                        open_main_window()
+                except Exception:
+                    pass
+            tray.activated.connect(_on_tray_activated)
+        except Exception:
+            # If tray activation connection fails, ignore
+            pass
 
-    # Snooze action
-    snooze_action = QAction(f"Snooze {app_state['snooze_minutes']} min", menu)
-    def do_snooze():
-        reminder_engine.snooze(app_state["snooze_minutes"]) 
-        log.info("User snoozed reminders for %s minutes", app_state["snooze_minutes"])
-    snooze_action.triggered.connect(do_snooze)
-
-    # Insert actions before Exit
-    actions = menu.actions()
-    if actions:
-        menu.insertAction(actions[0], open_action)
-        menu.insertAction(actions[0], snooze_action)
+        # Snooze action
+        snooze_action = QAction(_SNOOZE_TEXT.format(app_state["snooze_minutes"]), menu)
+        def do_snooze():
+            engine = app_state["reminder"]
+            if engine is None:
+                return
+            engine.snooze(app_state["snooze_minutes"])
+            log.info("User snoozed reminders for %s minutes", app_state["snooze_minutes"])
+        snooze_action.triggered.connect(do_snooze)
+
+        # Insert actions before Exit
+        actions = menu.actions()
+        if actions:
+            menu.insertAction(actions[0], open_action)
+            menu.insertAction(actions[0], snooze_action)
+        else:
+            menu.addAction(open_action)
+            menu.addAction(snooze_action)
     else:
-        menu.addAction(open_action)
-        menu.addAction(snooze_action)
+        # Without a tray there is nothing to hide into: show the window and quit when it closes
+        log.warning("System tray not available; showing the main window instead")
+        app.setQuitOnLastWindowClosed(True)
 
-    # Log on lock/unlock
-    watcher.session_locked.connect(lambda: log.info("System locked: polling suspended"))
-    watcher.session_unlocked.connect(lambda: log.info("System unlocked: polling resumed"))
+    # Polling: the HTTP request runs on a pool thread, results come back as signals
+    try:
+        from PyQt6.QtCore import QThreadPool
+        from .services.poll_worker import HeightPollTask, PollSignals
+    except ImportError:
+        from PyQt6.QtCore import QThreadPool
+        from deskcoach.services.poll_worker import HeightPollTask, PollSignals  # type: ignore
+    # One dedicated, never-expiring worker: polls run strictly one at a time and
+    # don't pay for a new thread each interval (the default expiry is 30 s)
+    pool = QThreadPool(app)
+    pool.setMaxThreadCount(1)
+    pool.setExpiryTimeout(-1)
+    poll_signals = PollSignals()
+    app_state["poll_inflight"] = False
+    # Bumped whenever a poll is scheduled; a pending shot with an older value is stale
+    app_state["poll_gen"] = 0
+
+    def _schedule_next_poll(delay_ms: Optional[int] = None) -> None:
+        """Arm the next poll relative to now (after the previous one finished).
+
+        Chained single shots can't stack up behind a slow request the way a
+        repeating timer can; re-arming also supersedes any pending shot.
+        """
+        app_state["poll_gen"] += 1
+        gen = app_state["poll_gen"]
+
+        def _fire() -> None:
+            if gen == app_state["poll_gen"]:
+                poll_once()
+
+        if delay_ms is None:
+            delay_ms = _poll_interval_ms()
+        # Minute-granularity polling doesn't need precise wakeups; let the OS coalesce them
+        QTimer.singleShot(delay_ms, Qt.TimerType.VeryCoarseTimer, _fire)
 
-    # Define the polling function
     def poll_once() -> None:
         # Skip polling when session is locked
+        if not app_state["unlocked"]:
+            _schedule_next_poll()
+            return
+        # Don't pile up requests; the in-flight poll schedules the next one when it completes
+        if app_state["poll_inflight"]:
+            log.debug("Previous poll still in flight; skipping")
+            return
+        app_state["poll_inflight"] = True
+        pool.start(HeightPollTask(app_state["cfg"].base_url, poll_signals, _store_sample))
+
+    def _poll_interval_ms() -> int:
+        current_cfg = app_state["cfg"]
+        interval_ms = max(1, int(round(current_cfg.poll_minutes * 60_000)))  # 0 would be an invalid timer
+        factor = max(1, int(getattr(current_cfg, "background_poll_factor", 1)))
+        win = app_state["main_window"]
+        if factor == 1 or (win is not None and win.isVisible()):
+            return interval_ms
+        # Window hidden: stretch to a heartbeat unless a reminder could come due before it
+        engine = app_state["reminder"]
+        due_min = engine.minutes_until_due() if engine is not None else None
+        if due_min is not None and due_min * 60_000 <= interval_ms * factor:
+            return interval_ms
+        return interval_ms * factor
+
+    def _on_window_visibility(visible: bool) -> None:
+        if int(getattr(app_state["cfg"], "background_poll_factor", 1)) <= 1 or app_state["poll_inflight"]:
+            return
+        # Visible: data may be a heartbeat old, fetch a fresh sample for the stats view.
+        # Hidden: re-arm with the stretched interval.
+        _schedule_next_poll(0 if visible else None)
+
+    def _store_sample(ts: int, height_mm: int) -> None:
+        # Runs on the poll thread: all DB work for a sample stays off the GUI thread
+        current_cfg = app_state["cfg"]
+        store.save_measurement(ts, height_mm)
+        log.info("Measurement saved: ts=%s height_mm=%s", ts, height_mm)
+        # Update daily aggregates for quick UI stats
         try:
-            if not watcher.is_unlocked():
-                return
+            stand_thr = int(getattr(current_cfg, "stand_threshold_mm", 900))
+            day_start_hour = int(getattr(current_cfg, "start_of_day_hour", 4))
+            store.update_daily_aggregates_now(stand_thr, ts, start_of_day_hour=day_start_hour)
         except Exception:
-            # if watcher fails, proceed
             pass
+        # Look up what the reminder engine will need, so _on_measured finds it cached
+        engine = app_state["reminder"]
+        if engine is not None:
+            engine.prefetch(ts, height_mm)
+
+    def _on_measured(ts: int, height_mm: int) -> None:
+        app_state["poll_inflight"] = False
         try:
-            current_cfg = app_state["cfg"]
-            height_mm = api_client.get_height_mm(current_cfg.base_url)
-            ts = int(time.time())
-            store.save_measurement(ts, height_mm)
-            log.info("Measurement saved: ts=%s height_mm=%s", ts, height_mm)
-            # Update daily aggregates for quick UI stats
-            try:
-                stand_thr = int(getattr(current_cfg, "stand_threshold_mm", 900))
-                day_start_hour = int(getattr(current_cfg, "start_of_day_hour", 4))
-                store.update_daily_aggregates_now(stand_thr, ts, start_of_day_hour=day_start_hour)
-            except Exception:
-                pass
             # Feed reminder engine
-            try:
-                reminder_engine.on_new_measurement(ts, height_mm)
-            except Exception:
-                pass
+            engine = app_state["reminder"]
+            if engine is not None:
+                try:
+                    engine.on_new_measurement(ts, height_mm)
+                except Exception:
+                    pass
         except Exception as e:
             log.warning("Polling failed: %s", e)
+        finally:
+            _schedule_next_poll()
+
+    def _on_poll_failed(message: str) -> None:
+        app_state["poll_inflight"] = False
+        log.warning("Polling failed: %s", message)
+        _schedule_next_poll()
+
+    poll_signals.measured.connect(_on_measured)
+    poll_signals.failed.connect(_on_poll_failed)
+
+    def _start_session_services() -> None:
+        # Session watcher and reminder engine (imported here to keep them off the startup path)
+        try:
+            from .services.session_watcher import SessionWatcher
+            from .services.reminder import ReminderEngine
+        except ImportError:
+            from deskcoach.services.session_watcher import SessionWatcher  # type: ignore
+            from deskcoach.services.reminder import ReminderEngine  # type: ignore
+        watcher = SessionWatcher(emit_initial_event=True)
+        app_state["watcher"] = watcher
+        app_state["reminder"] = ReminderEngine(cfg, watcher)
+        # Mirror the lock state so poll_once only reads a bool; log on lock/unlock
+        try:
+            app_state["unlocked"] = bool(watcher.is_unlocked())
+        except Exception:
+            pass  # if the watcher fails, keep polling
+
+        def _on_locked() -> None:
+            app_state["unlocked"] = False
+            log.info("System locked: polling suspended")
+
+        def _on_unlocked() -> None:
+            app_state["unlocked"] = True
+            log.info("System unlocked: polling resumed")
 
-    # Set up the timer
-    timer = QTimer()
-    interval_ms = int(cfg.poll_minutes * 60_000)
-    if interval_ms <= 0:
-        interval_ms = 1  # minimum to avoid invalid timer
-    timer.setInterval(interval_ms)
-    timer.timeout.connect(poll_once)
-    timer.start()
+        watcher.session_locked.connect(_on_locked)
+        watcher.session_unlocked.connect(_on_unlocked)
+        # First poll right away; each completed poll schedules the next
+        poll_once()
 
     # Optional: handle app aboutToQuit cleanup
     def _cleanup():
-        tray.hide()
+        app_state["poll_gen"] += 1  # invalidate the pending poll shot
+        # Let an in-flight request finish (bounded) so its thread isn't torn down mid-call
+        pool.waitForDone(2000)
+        watcher = app_state["watcher"]
+        if watcher is not None:
+            watcher.flush_events()
         try:
-            main_window.hide()
-        except Exception:
+            instance_server.close()
+        except AttributeError:
             pass
+        if tray is not None:
+            tray.hide()
+        win = app_state["main_window"]
+        if win is not None:
+            try:
+                win.hide()
+            except Exception:
+                pass
 
     app.aboutToQuit.connect(_cleanup)
 
-    # Kick an immediate first poll without waiting full interval
-    QTimer.singleShot(0, poll_once)
+    if tray is None:
+        open_main_window()
+    QTimer.singleShot(0, _start_session_services)
 
     return app.exec()
 
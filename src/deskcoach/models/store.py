@@ -5,26 +5,50 @@ Also contains simple daily aggregation helpers for seated/standing durations.
 """
 from __future__ import annotations
 
+import atexit
+import functools
 import logging
 import sqlite3
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Iterator
+from datetime import date, datetime, timedelta, timezone
 
-from platformdirs import PlatformDirs
+try:
+    from ..config import get_data_dir
+except Exception:  # pragma: no cover
+    from deskcoach.config import get_data_dir  # type: ignore
 
 log = logging.getLogger(__name__)
 
-APP_NAME = "DeskCoach"
-APP_AUTHOR = "DeskCoach"  # same for Windows; not critical
 _DB_FILENAME = "deskcoach.db"
 
+# Stored in PRAGMA user_version once init_db() has brought the schema up to date;
+# bump it whenever the DDL below changes so existing databases get migrated.
+SCHEMA_VERSION = 5
 
+# session_events.event values
+EVENT_LOCK = 0
+EVENT_UNLOCK = 1
+_EVENT_CODE = {"LOCK": EVENT_LOCK, "UNLOCK": EVENT_UNLOCK, "lock": EVENT_LOCK, "unlock": EVENT_UNLOCK}
+
+# Long-lived connection per thread (WAL, autocommit) for reads and writes;
+# writes use BEGIN IMMEDIATE via _write()
+_tls = threading.local()
+
+
+@functools.lru_cache(maxsize=1)
 def db_path() -> Path:
-    """Public accessor for the database path in the user data directory."""
-    dirs = PlatformDirs(appname=APP_NAME, appauthor=APP_AUTHOR, roaming=False)
-    data_dir = Path(dirs.user_data_dir)
-    data_dir.mkdir(parents=True, exist_ok=True)
-    return data_dir / _DB_FILENAME
+    """Public accessor for the database path in the user data directory.
+
+    Cached: the data directory doesn't change while the app runs, and resolving
+    it creates the folder (a syscall) each time.
+    """
+    return get_data_dir() / _DB_FILENAME
 
 
 def db_exists() -> bool:
@@ -32,6 +56,40 @@ def db_exists() -> bool:
     return db_path().exists()
 
 
+# Whole schema as one script (executescript runs it in a single call). Tables
+# are created only if missing; older secondary indexes are dropped.
+_SCHEMA_SQL = f"""
+BEGIN IMMEDIATE;
+-- Measurements, clustered on ts (one sample per second at most)
+CREATE TABLE IF NOT EXISTS measurements (
+    ts INTEGER PRIMARY KEY,
+    height_mm INTEGER NOT NULL
+) WITHOUT ROWID;
+-- Session events: event is EVENT_LOCK (0) or EVENT_UNLOCK (1)
+CREATE TABLE IF NOT EXISTS session_events (
+    ts INTEGER NOT NULL,
+    event INTEGER NOT NULL CHECK (event IN (0, 1))
+);
+-- Daily aggregates for quick UI stats
+CREATE TABLE IF NOT EXISTS daily_aggregates (
+    date TEXT PRIMARY KEY,                 -- YYYY-MM-DD (local date)
+    sitting_sec INTEGER NOT NULL,
+    standing_sec INTEGER NOT NULL,
+    updated_ts INTEGER NOT NULL            -- last aggregation wall-clock ts
+);
+-- Covers the by-time event lookups, so they never touch table rows
+DROP INDEX IF EXISTS idx_session_events_ts;
+CREATE INDEX IF NOT EXISTS idx_session_events_ts_event ON session_events(ts, event);
+-- Per-kind lookups (newest UNLOCK, newest LOCK before a ts) seek instead of scanning
+CREATE INDEX IF NOT EXISTS idx_session_events_event_ts ON session_events(event, ts);
+-- The ts primary key already serves range scans
+DROP INDEX IF EXISTS idx_measurements_ts;
+DROP INDEX IF EXISTS idx_measurements_ts_height;
+PRAGMA user_version={SCHEMA_VERSION};
+COMMIT;
+"""
+
+
 def init_db() -> Path:
     """Initialize database and ensure schema exists. Returns DB path.
 
@@ -39,43 +97,24 @@ def init_db() -> Path:
     for trends. If not found, it creates a new one and the required schema.
     """
     path = db_path()
+    path.parent.mkdir(parents=True, exist_ok=True)  # db_path() is cached; the folder may be gone
     existed = path.exists()
-    conn = sqlite3.connect(path)
+    conn = _get_conn(path)
+    if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+        # Warm start: schema already current, skip the DDL
+        log.info("Found existing database at %s", path)
+        return path
+    # The rebuilds only touch tables left by older versions; the schema script
+    # then creates whatever is missing, indexes included, in one transaction
+    with _write(conn):
+        _migrate_rowid_measurements(conn)
+        _migrate_text_session_events(conn)
     try:
-        # Measurements table
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS measurements (
-                ts INTEGER NOT NULL,
-                height_mm INTEGER NOT NULL
-            )
-            """
-        )
-        # Session events table: event is 'LOCK' or 'UNLOCK'
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS session_events (
-                ts INTEGER NOT NULL,
-                event TEXT NOT NULL CHECK (event IN ('LOCK','UNLOCK'))
-            )
-            """
-        )
-        # Daily aggregates for quick UI stats
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS daily_aggregates (
-                date TEXT PRIMARY KEY,                 -- YYYY-MM-DD (local date)
-                sitting_sec INTEGER NOT NULL,
-                standing_sec INTEGER NOT NULL,
-                updated_ts INTEGER NOT NULL           -- last aggregation wall-clock ts
-            )
-            """
-        )
-        # Helpful index for recent queries
-        conn.execute("CREATE INDEX IF NOT EXISTS idx_session_events_ts ON session_events(ts)")
-        conn.commit()
-    finally:
-        conn.close()
+        conn.executescript(_SCHEMA_SQL)
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
     if existed:
         log.info("Found existing database at %s", path)
     else:
@@ -83,8 +122,182 @@ def init_db() -> Path:
     return path
 
 
-_essql = "INSERT INTO measurements(ts, height_mm) VALUES (?, ?)"
+def _migrate_rowid_measurements(conn: sqlite3.Connection) -> None:
+    """Rebuild a rowid measurements table as WITHOUT ROWID keyed by ts.
+
+    Runs inside the caller's transaction; a missing table is left to the schema
+    script. Of several samples with the same ts, the one inserted last is kept.
+    """
+    cols = conn.execute("PRAGMA table_info(measurements)").fetchall()
+    if not cols or any(row[1] == "ts" and row[5] for row in cols):
+        return
+    conn.execute(
+        """
+        CREATE TABLE measurements_v2 (
+            ts INTEGER PRIMARY KEY,
+            height_mm INTEGER NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO measurements_v2(ts, height_mm) "
+        "SELECT ts, height_mm FROM measurements ORDER BY rowid"
+    )
+    conn.execute("DROP TABLE measurements")  # drops its indexes with it
+    conn.execute("ALTER TABLE measurements_v2 RENAME TO measurements")
+    log.info("Migrated measurements to a ts-keyed table")
+
+
+def _migrate_text_session_events(conn: sqlite3.Connection) -> None:
+    """Convert a session_events table from 'LOCK'/'UNLOCK' text to integer codes.
+
+    Runs inside the caller's transaction; a missing table is left to the schema
+    script.
+    """
+    col_types = {row[1]: str(row[2]).upper() for row in conn.execute("PRAGMA table_info(session_events)")}
+    if col_types.get("event") != "TEXT":
+        return
+    conn.execute(
+        """
+        CREATE TABLE session_events_v2 (
+            ts INTEGER NOT NULL,
+            event INTEGER NOT NULL CHECK (event IN (0, 1))
+        )
+        """
+    )
+    conn.execute(
+        "INSERT INTO session_events_v2(ts, event) "
+        "SELECT ts, CASE event WHEN 'LOCK' THEN 0 ELSE 1 END FROM session_events"
+    )
+    conn.execute("DROP TABLE session_events")  # drops its indexes with it
+    conn.execute("ALTER TABLE session_events_v2 RENAME TO session_events")
+    log.info("Migrated session_events to integer event codes")
+
+
+# A second sample within the same second replaces the first
+_essql = "INSERT OR REPLACE INTO measurements(ts, height_mm) VALUES (?, ?)"
 _sesql = "INSERT INTO session_events(ts, event) VALUES (?, ?)"
+# Queries run on every poll/UI refresh; one constant text each so they stay in
+# the connection's statement cache
+_measurements_range_sql = "SELECT ts, height_mm FROM measurements WHERE ts >= ? AND ts <= ? ORDER BY ts ASC"
+_daily_dates_since_sql = "SELECT date FROM daily_aggregates WHERE date >= ?"
+_last_sample_ts_sql = "SELECT MAX(ts) FROM measurements WHERE ts > ? AND ts <= ?"
+_first_sample_ts_sql = "SELECT MIN(ts) FROM measurements"
+_daily_row_sql = "SELECT sitting_sec, standing_sec, updated_ts FROM daily_aggregates WHERE date=?"
+_daily_totals_sql = "SELECT sitting_sec, standing_sec FROM daily_aggregates WHERE date=?"
+# Same attribution as utils.time_stats.accumulate_sit_stand_seconds for a window
+# without locks: each sample owns the time until the next one (the last one until
+# :end), capped at :max_gap seconds
+_sit_stand_sql = """
+    SELECT
+        COALESCE(SUM(CASE WHEN height_mm < :thr THEN dt END), 0),
+        COALESCE(SUM(CASE WHEN height_mm >= :thr THEN dt END), 0)
+    FROM (
+        SELECT height_mm, MIN(LEAD(ts, 1, :end) OVER (ORDER BY ts), ts + :max_gap) - ts AS dt
+        FROM measurements
+        WHERE ts >= :start AND ts <= :end
+    )
+"""
+# Lock intervals inside (:start, :end]: a synthetic row at :start carries the
+# state of the last event at or before :start (UNLOCK when there is none),
+# repeated events are dropped (LAG), and each LOCK transition runs until the
+# next transition or :end (LEAD).
+_lock_intervals_sql = """
+    WITH ev AS (
+        SELECT :start AS ts, COALESCE(
+            (SELECT event FROM session_events WHERE ts <= :start ORDER BY ts DESC LIMIT 1),
+            :unlock
+        ) AS event
+        UNION ALL
+        SELECT ts, event FROM session_events WHERE ts > :start AND ts <= :end
+    ),
+    transitions AS (
+        SELECT ts, event FROM (
+            SELECT ts, event, LAG(event) OVER (ORDER BY ts) AS prev FROM ev
+        )
+        WHERE prev IS NULL OR event != prev
+    ),
+    spans AS (
+        SELECT ts, event, LEAD(ts, 1, :end) OVER (ORDER BY ts) AS next_ts FROM transitions
+    )
+    SELECT ts, next_ts FROM spans
+    WHERE event = :lock AND next_ts > ts
+    ORDER BY ts
+"""
+# Unchanged totals are not rewritten (updated_ts then keeps the time of the last change)
+_daily_upsert_sql = """
+    INSERT INTO daily_aggregates(date, sitting_sec, standing_sec, updated_ts)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+        sitting_sec=excluded.sitting_sec,
+        standing_sec=excluded.standing_sec,
+        updated_ts=excluded.updated_ts
+    WHERE sitting_sec != excluded.sitting_sec OR standing_sec != excluded.standing_sec
+"""
+
+
+# Per-connection tuning; journal_mode=WAL is persistent in the file, the rest is not
+_CONN_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",  # safe with WAL; fsync only at checkpoints
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB upper bound, grown on demand
+    "PRAGMA busy_timeout=3000",
+)
+
+
+def connect(path: Path | None = None, **kwargs: Any) -> sqlite3.Connection:
+    """Open a connection to the database (default: db_path()) with the app's PRAGMAs applied."""
+    conn = sqlite3.connect(path if path is not None else db_path(), **kwargs)
+    for pragma in _CONN_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _get_conn(path: Path) -> sqlite3.Connection:
+    """Return this thread's connection for `path`, (re)opening it in WAL mode."""
+    conn = getattr(_tls, "conn", None)
+    if conn is None or _tls.path != path:
+        if conn is not None:
+            conn.close()
+        # Room for every statement this module runs, so none is re-prepared
+        conn = connect(path, isolation_level=None, cached_statements=256)
+        _tls.conn, _tls.path = conn, path
+    return conn
+
+
+@contextmanager
+def _write(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Wrap writes in BEGIN IMMEDIATE/COMMIT; joins a transaction already open on conn."""
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def read_connection() -> sqlite3.Connection:
+    """Return the calling thread's shared connection.
+
+    The store owns it: don't close it or use it as a context manager.
+    """
+    return _get_conn(db_path())
+
+
+def _close_thread_conn() -> None:
+    conn = getattr(_tls, "conn", None)
+    if conn is not None:
+        _tls.conn = None
+        conn.close()
+
+
+atexit.register(_close_thread_conn)
 
 
 def save_measurement(ts: int, height_mm: int) -> None:
@@ -97,36 +310,91 @@ def save_measurement(ts: int, height_mm: int) -> None:
     height_mm: int
         Height in millimeters.
     """
-    path = db_path()
-    with sqlite3.connect(path) as conn:
+    with _write(_get_conn(db_path())) as conn:
         conn.execute(_essql, (ts, height_mm))
-        conn.commit()
-    log.debug("Saved measurement ts=%s height_mm=%s", ts, height_mm)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Saved measurement ts=%s height_mm=%s", ts, height_mm)
+
+
+def save_measurements(rows: Iterable[tuple[int, int]]) -> None:
+    """Insert several measurements (ts, height_mm) in one transaction."""
+    batch = [(int(ts), int(height_mm)) for ts, height_mm in rows]
+    if not batch:
+        return
+    with transaction() as conn:
+        conn.executemany(_essql, batch)
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Saved %d measurement(s), last ts=%s", len(batch), batch[-1][0])
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """Run writes on this thread's connection as one transaction.
+
+    Commits on success, rolls back on error. Nested use joins the outer
+    transaction.
+    """
+    with _write(_get_conn(db_path())) as conn:
+        yield conn
+
+
+def _event_code(event: str) -> int:
+    code = _EVENT_CODE.get(event)
+    if code is None:
+        # Uncommon spellings ("Lock"); callers in this package pass upper case
+        code = _EVENT_CODE.get(str(event).upper())
+        if code is None:
+            raise ValueError(f"Invalid session event: {event}")
+    return code
 
 
 def save_session_event(ts: int, event: str) -> None:
     """Persist a session event ('LOCK' or 'UNLOCK')."""
-    ev = event.upper()
-    if ev not in ("LOCK", "UNLOCK"):
-        raise ValueError(f"Invalid session event: {event}")
-    path = db_path()
+    save_session_events(((ts, event),))
+
+
+def save_session_events(events: Iterable[tuple[int, str]]) -> None:
+    """Persist several session events (ts, 'LOCK'/'UNLOCK') in one transaction."""
+    rows = [(int(ts), _event_code(event)) for ts, event in events]
+    if not rows:
+        return
     try:
-        with sqlite3.connect(path) as conn:
-            conn.execute(_sesql, (ts, ev))
-            conn.commit()
-        log.debug("Saved session event ts=%s event=%s", ts, ev)
+        with transaction() as conn:
+            conn.executemany(_sesql, rows)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Saved %d session event(s), last ts=%s", len(rows), rows[-1][0])
     except Exception as e:  # pragma: no cover - defensive
-        log.debug("Failed to save session event: %s", e)
+        log.debug("Failed to save session events: %s", e)
 
 
 # ------------------------ Aggregation helpers ------------------------
 
+def _clamp_hour(start_of_day_hour: int) -> int:
+    return min(23, max(0, int(start_of_day_hour)))
+
+
 def _seconds_since_day_start(ts: int, start_of_day_hour: int = 0) -> int:
-    dt = datetime.fromtimestamp(ts)
-    day_start = dt.replace(hour=int(start_of_day_hour), minute=0, second=0, microsecond=0)
-    if dt < day_start:
+    return int(ts) - _day_bounds_local(ts, start_of_day_hour)[0]
+
+
+def _day_start_ts(ts: int, start_hour: int) -> int:
+    """Most recent local start_hour:00 at or before ts.
+
+    Integer arithmetic with the UTC offset in effect at ts. Near a DST change
+    it defers to datetime (fold included), so ambiguous and skipped hours
+    resolve exactly as datetime.fromtimestamp(ts).replace(hour=...) does.
+    """
+    off = time.localtime(ts).tm_gmtoff
+    local = ts + off
+    start = local - (local - start_hour * 3600) % 86400 - off
+    # Offsets in effect a little before/after the guess reveal a nearby DST change
+    if off == time.localtime(start - 7200).tm_gmtoff == time.localtime(start + 7200).tm_gmtoff:
+        return start
+    base = datetime.fromtimestamp(ts)
+    day_start = base.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+    if base < day_start:
         day_start = day_start - timedelta(days=1)
-    return int((dt - day_start).total_seconds())
+    return int(day_start.timestamp())
 
 
 def _day_bounds_local(ts: int | None = None, start_of_day_hour: int = 0) -> tuple[int, str]:
@@ -138,16 +406,8 @@ def _day_bounds_local(ts: int | None = None, start_of_day_hour: int = 0) -> tupl
 
     Returns (start_ts, date_str).
     """
-    start_hour = int(start_of_day_hour)
-    if start_hour < 0:
-        start_hour = 0
-    if start_hour > 23:
-        start_hour = 23
-    base = datetime.fromtimestamp(ts) if ts is not None else datetime.now()
-    start = base.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-    if base < start:
-        start = start - timedelta(days=1)
-    return int(start.timestamp()), start.strftime("%Y-%m-%d")
+    start = _day_start_ts(int(ts) if ts is not None else int(time.time()), _clamp_hour(start_of_day_hour))
+    return start, time.strftime("%Y-%m-%d", time.localtime(start))
 
 
 def _locked_intervals(start_ts: int, end_ts: int) -> list[tuple[int, int]]:
@@ -159,101 +419,104 @@ def _locked_intervals(start_ts: int, end_ts: int) -> list[tuple[int, int]]:
     """
     if end_ts <= start_ts:
         return []
-    intervals: list[tuple[int, int]] = []
     path = db_path()
     try:
-        with sqlite3.connect(path) as conn:
-            row = conn.execute(
-                "SELECT ts, event FROM session_events WHERE ts <= ? ORDER BY ts DESC LIMIT 1",
-                (start_ts,),
-            ).fetchone()
-            start_locked = bool(row and str(row[1]).upper() == "LOCK")
-            # Events in window
-            cur = conn.execute(
-                "SELECT ts, event FROM session_events WHERE ts > ? AND ts <= ? ORDER BY ts ASC",
-                (start_ts, end_ts),
-            )
-            events = [(int(r[0]), str(r[1]).upper()) for r in cur]
+        cur = _get_conn(path).execute(
+            _lock_intervals_sql,
+            {"start": start_ts, "end": end_ts, "lock": EVENT_LOCK, "unlock": EVENT_UNLOCK},
+        )
+        # INTEGER columns and integer parameters: the rows are int tuples already
+        return cur.fetchall()
     except Exception:
         # On any DB error, assume no locks to avoid undercounting time
         return []
 
-    locked = start_locked
-    lock_start: int | None = start_ts if locked else None
-    for ts, ev in events:
-        if ev == "LOCK":
-            if not locked:
-                locked = True
-                lock_start = max(ts, start_ts)
-        elif ev == "UNLOCK":
-            if locked and lock_start is not None:
-                lock_end = min(ts, end_ts)
-                if lock_end > lock_start:
-                    intervals.append((lock_start, lock_end))
-                locked = False
-                lock_start = None
-    if locked and lock_start is not None:
-        lock_end = end_ts
-        if lock_end > lock_start:
-            intervals.append((lock_start, lock_end))
-    return intervals
-
 
 def compute_day_aggregates(start_ts: int, end_ts: int, stand_threshold_mm: int) -> tuple[int, int]:
     """Compute seated/standing seconds between [start_ts, end_ts] using samples,
     excluding time while the session is locked.
 
     Delegates time attribution to utils.time_stats.accumulate_sit_stand_seconds
-    to keep separation of concerns (DB I/O vs. time math).
+    to keep separation of concerns (DB I/O vs. time math). Windows without any
+    lock use an equivalent single SQL query instead.
     """
     if end_ts <= start_ts:
         return 0, 0
-    path = db_path()
     try:
-        with sqlite3.connect(path) as conn:
-            cur = conn.execute(
-                "SELECT ts, height_mm FROM measurements WHERE ts >= ? AND ts <= ? ORDER BY ts ASC",
-                (start_ts, end_ts),
-            )
-            rows = [(int(r[0]), int(r[1])) for r in cur]
-    except Exception:
-        rows = []
-    if not rows:
-        return 0, 0
+        from ..utils.time_stats import DEFAULT_MAX_GAP_SEC, accumulate_sit_stand_seconds_arrays
+    except Exception:  # pragma: no cover - fallback for absolute import usage
+        from deskcoach.utils.time_stats import DEFAULT_MAX_GAP_SEC, accumulate_sit_stand_seconds_arrays  # type: ignore
 
-    # Build lock intervals
     lock_intervals = _locked_intervals(start_ts, end_ts)
-
-    # Delegate to utility function
+    path = db_path()
     try:
-        from ..utils.time_stats import accumulate_sit_stand_seconds
-    except Exception:  # pragma: no cover - fallback for absolute import usage
-        from deskcoach.utils.time_stats import accumulate_sit_stand_seconds  # type: ignore
+        conn = _get_conn(path)
+        if not lock_intervals:
+            # Nothing to subtract: SQLite sums the per-sample durations in one pass
+            seated, standing = conn.execute(
+                _sit_stand_sql,
+                {"start": start_ts, "end": end_ts, "thr": int(stand_threshold_mm), "max_gap": DEFAULT_MAX_GAP_SEC},
+            ).fetchone()
+            return int(seated), int(standing)
+        # Both columns are INTEGER NOT NULL; stream them into flat int64 columns
+        ts, heights = array("q"), array("q")
+        for t, h in conn.execute(_measurements_range_sql, (start_ts, end_ts)):
+            ts.append(t)
+            heights.append(h)
+    except Exception:
+        return 0, 0
+    if not ts:
+        return 0, 0
 
-    seated, standing = accumulate_sit_stand_seconds(
-        measurements=rows,
-        lock_intervals=lock_intervals,
-        stand_threshold_mm=int(stand_threshold_mm),
-        end_ts=int(end_ts),
+    seated, standing = accumulate_sit_stand_seconds_arrays(
+        ts,
+        heights,
+        array("q", [l[0] for l in lock_intervals]),
+        array("q", [l[1] for l in lock_intervals]),
+        int(stand_threshold_mm),
+        int(end_ts),
     )
     return seated, standing
 
 
 def upsert_daily_aggregate(date_str: str, sitting_sec: int, standing_sec: int, updated_ts: int) -> None:
     path = db_path()
-    with sqlite3.connect(path) as conn:
-        conn.execute(
-            """
-            INSERT INTO daily_aggregates(date, sitting_sec, standing_sec, updated_ts)
-            VALUES (?, ?, ?, ?)
-            ON CONFLICT(date) DO UPDATE SET
-                sitting_sec=excluded.sitting_sec,
-                standing_sec=excluded.standing_sec,
-                updated_ts=excluded.updated_ts
-            """,
-            (date_str, int(sitting_sec), int(standing_sec), int(updated_ts)),
-        )
-        conn.commit()
+    with _write(_get_conn(path)) as conn:
+        conn.execute(_daily_upsert_sql, (date_str, int(sitting_sec), int(standing_sec), int(updated_ts)))
+
+
+# Today's totals up to a checkpoint: (db path, day start, threshold, checkpoint ts, sitting, standing).
+# The checkpoint is always a sample timestamp, where attribution splits exactly:
+# compute(start, now) == compute(start, cp) + compute(cp, now).
+_today_checkpoint: tuple[Path, int, int, int, int, int] | None = None
+
+
+def _compute_today(start_ts: int, now: int, stand_threshold_mm: int) -> tuple[int, int]:
+    """compute_day_aggregates(start_ts, now, ...) that only scans samples since the last call."""
+    global _today_checkpoint
+    thr = int(stand_threshold_mm)
+    path = db_path()
+    cp = _today_checkpoint
+    if cp is not None and cp[:3] == (path, start_ts, thr) and cp[3] <= now:
+        cp_ts, sitting, standing = cp[3], cp[4], cp[5]
+    else:
+        cp_ts, sitting, standing = start_ts, 0, 0
+    try:
+        row = _get_conn(path).execute(_last_sample_ts_sql, (cp_ts, now)).fetchone()
+        last_ts = row[0] if row else None
+    except Exception:
+        last_ts = None
+    if last_ts is not None:
+        s, t = compute_day_aggregates(cp_ts, last_ts, thr)
+        cp_ts, sitting, standing = last_ts, sitting + s, standing + t
+        _today_checkpoint = (path, start_ts, thr, cp_ts, sitting, standing)
+    s, t = compute_day_aggregates(cp_ts, now, thr)
+    return sitting + s, standing + t
+
+
+def _reset_today_checkpoint() -> None:
+    global _today_checkpoint
+    _today_checkpoint = None
 
 
 def update_daily_aggregates_now(
@@ -262,9 +525,9 @@ def update_daily_aggregates_now(
     start_of_day_hour: int = 0,
 ) -> None:
     """Recompute current-day aggregates from configured day start until now and upsert."""
-    now = int(now_ts if now_ts is not None else datetime.now().timestamp())
+    now = int(now_ts if now_ts is not None else time.time())
     start_ts, date_str = _day_bounds_local(now, start_of_day_hour)
-    sitting, standing = compute_day_aggregates(start_ts, now, stand_threshold_mm)
+    sitting, standing = _compute_today(start_ts, now, stand_threshold_mm)
     upsert_daily_aggregate(date_str, sitting, standing, now)
 
 
@@ -274,25 +537,22 @@ def get_today_aggregates(
     start_of_day_hour: int = 0,
 ) -> tuple[int, int]:
     """Return (sitting_sec, standing_sec) for configured "today", recomputing if needed."""
-    now = int(now_ts if now_ts is not None else datetime.now().timestamp())
+    now = int(now_ts if now_ts is not None else time.time())
     start_ts, date_str = _day_bounds_local(now, start_of_day_hour)
     # Try read existing row first
     path = db_path()
     try:
-        with sqlite3.connect(path) as conn:
-            row = conn.execute(
-                "SELECT sitting_sec, standing_sec, updated_ts FROM daily_aggregates WHERE date=?",
-                (date_str,),
-            ).fetchone()
-            if row:
-                # If last update earlier than a few minutes, recompute for freshness
-                sitting_sec, standing_sec, updated_ts = int(row[0]), int(row[1]), int(row[2])
-                if updated_ts >= now - 120:  # 2 minutes freshness window
-                    return sitting_sec, standing_sec
+        conn = _get_conn(path)
+        row = conn.execute(_daily_row_sql, (date_str,)).fetchone()
+        if row:
+            # If last update earlier than a few minutes, recompute for freshness
+            sitting_sec, standing_sec, updated_ts = int(row[0]), int(row[1]), int(row[2])
+            if updated_ts >= now - 120:  # 2 minutes freshness window
+                return sitting_sec, standing_sec
     except Exception:
         pass
     # Fallback to recompute
-    sitting, standing = compute_day_aggregates(start_ts, now, stand_threshold_mm)
+    sitting, standing = _compute_today(start_ts, now, stand_threshold_mm)
     upsert_daily_aggregate(date_str, sitting, standing, now)
     return sitting, standing
 
@@ -314,7 +574,7 @@ def get_yesterday_aggregates_until_same_time(
     to yesterday uses direct computation so you may not see a ``daily_aggregates``
     entry for yesterday. That is expected.
     """
-    now = int(now_ts if now_ts is not None else datetime.now().timestamp())
+    now = int(now_ts if now_ts is not None else time.time())
     sec_since_day_start = _seconds_since_day_start(now, start_of_day_hour)
     today_start_ts, _ = _day_bounds_local(now, start_of_day_hour)
     y_start_ts = today_start_ts - 24 * 3600
@@ -326,18 +586,13 @@ def get_yesterday_aggregates_until_same_time(
 def _day_bounds_for_date_str(date_str: str, start_of_day_hour: int = 0) -> tuple[int, int]:
     """Return (start_ts, end_ts) for date_str and configured day start hour."""
     try:
-        dt = datetime.strptime(date_str, "%Y-%m-%d")
+        y, m, d = (int(part) for part in date_str.split("-"))
+        date(y, m, d)  # validate
     except Exception:
         # Fallback to today
         start_ts, _ = _day_bounds_local(None, start_of_day_hour)
         return start_ts, start_ts + 24 * 3600
-    start_hour = int(start_of_day_hour)
-    if start_hour < 0:
-        start_hour = 0
-    if start_hour > 23:
-        start_hour = 23
-    start = dt.replace(hour=start_hour, minute=0, second=0, microsecond=0)
-    start_ts = int(start.timestamp())
+    start_ts = int(time.mktime((y, m, d, _clamp_hour(start_of_day_hour), 0, 0, 0, 0, -1)))
     return start_ts, start_ts + 24 * 3600
 
 
@@ -355,13 +610,10 @@ def get_aggregate_for_date(date_str: str) -> tuple[int, int] | None:
     """Return (sitting_sec, standing_sec) for date if present in daily_aggregates."""
     path = db_path()
     try:
-        with sqlite3.connect(path) as conn:
-            row = conn.execute(
-                "SELECT sitting_sec, standing_sec FROM daily_aggregates WHERE date=?",
-                (date_str,),
-            ).fetchone()
-            if row:
-                return int(row[0]), int(row[1])
+        conn = _get_conn(path)
+        row = conn.execute(_daily_totals_sql, (date_str,)).fetchone()
+        if row:
+            return int(row[0]), int(row[1])
     except Exception:
         pass
     return None
@@ -384,7 +636,7 @@ def ensure_daily_aggregate(
     # Compute once and persist
     sitting, standing = compute_full_day_aggregates_for_date(date_str, stand_threshold_mm, start_of_day_hour)
     try:
-        now_ts = int(datetime.now().timestamp())
+        now_ts = int(time.time())
         upsert_daily_aggregate(date_str, sitting, standing, now_ts)
     except Exception:
         pass
@@ -397,7 +649,7 @@ def get_yesterday_full_aggregate(
     start_of_day_hour: int = 0,
 ) -> tuple[int, int]:
     """Return full-day (sitting_sec, standing_sec) for yesterday, ensuring it's cached."""
-    now = int(now_ts if now_ts is not None else datetime.now().timestamp())
+    now = int(now_ts if now_ts is not None else time.time())
     today_start_ts, _today_str = _day_bounds_local(now, start_of_day_hour)
     # Compute yesterday's date string
     y_dt = datetime.fromtimestamp(today_start_ts) - timedelta(days=1)
@@ -415,36 +667,61 @@ def backfill_past_aggregates(
     - Finds the first measurement timestamp and iterates through each local date
       up to yesterday, computing and inserting missing aggregates.
     - Skips days that already have an entry.
+    - Reads measurements and lock intervals for the whole range once; each day
+      gets the same result as compute_full_day_aggregates_for_date().
     """
-    now = int(upto_now_ts if upto_now_ts is not None else datetime.now().timestamp())
+    now = int(upto_now_ts if upto_now_ts is not None else time.time())
     path = db_path()
     first_ts: int | None = None
     try:
-        with sqlite3.connect(path) as conn:
-            row = conn.execute("SELECT MIN(ts) FROM measurements").fetchone()
-            if row and row[0] is not None:
-                first_ts = int(row[0])
+        conn = _get_conn(path)
+        row = conn.execute(_first_sample_ts_sql).fetchone()
+        if row and row[0] is not None:
+            first_ts = int(row[0])
     except Exception:
         first_ts = None
     if first_ts is None:
         return  # nothing to backfill
-    # Start from local date of first_ts
-    start_of_first, _ = _day_bounds_local(first_ts, start_of_day_hour)
-    start_dt = datetime.fromtimestamp(start_of_first)
-    today_start_ts, _ = _day_bounds_local(now, start_of_day_hour)
-    # Iterate day by day until yesterday
-    cur_dt = start_dt
-    yesterday_dt = datetime.fromtimestamp(today_start_ts) - timedelta(days=1)
+    # Local dates from the first measurement's day up to yesterday
+    _, first_date = _day_bounds_local(first_ts, start_of_day_hour)
+    today_start_ts, today_date = _day_bounds_local(now, start_of_day_hour)
+    cur_day = date.fromisoformat(first_date)
+    last_day = date.fromisoformat(today_date) - timedelta(days=1)
+    if cur_day > last_day:
+        return
+    try:
+        from ..utils.time_stats import accumulate_sit_stand_seconds
+    except Exception:  # pragma: no cover - fallback for absolute import usage
+        from deskcoach.utils.time_stats import accumulate_sit_stand_seconds  # type: ignore
     try:
-        with sqlite3.connect(path) as conn:
-            while cur_dt <= yesterday_dt:
-                ds = cur_dt.strftime("%Y-%m-%d")
-                # Skip if exists
-                row = conn.execute("SELECT 1 FROM daily_aggregates WHERE date=?", (ds,)).fetchone()
-                if not row:
-                    s, t = compute_full_day_aggregates_for_date(ds, stand_threshold_mm, start_of_day_hour)
-                    upsert_daily_aggregate(ds, s, t, int(now))
-                cur_dt = cur_dt + timedelta(days=1)
+        conn = _get_conn(path)
+        existing = {r[0] for r in conn.execute(_daily_dates_since_sql, (first_date,))}
+        range_start, _ = _day_bounds_for_date_str(first_date, start_of_day_hour)
+        _, range_end = _day_bounds_for_date_str(last_day.isoformat(), start_of_day_hour)
+        # Load the whole range once and slice it per day instead of querying each day
+        rows = conn.execute(_measurements_range_sql, (range_start, range_end)).fetchall()
+        row_ts = [r[0] for r in rows]
+        locks = _locked_intervals(range_start, range_end)
+        rows_to_write: list[tuple[str, int, int, int]] = []
+        while cur_day <= last_day:
+            ds = cur_day.isoformat()
+            cur_day += timedelta(days=1)
+            if ds in existing:
+                continue
+            day_start, day_end = _day_bounds_for_date_str(ds, start_of_day_hour)
+            day_rows = rows[bisect_left(row_ts, day_start):bisect_right(row_ts, day_end)]
+            if day_rows:
+                day_locks = [
+                    (max(a, day_start), min(b, day_end)) for a, b in locks if a < day_end and b > day_start
+                ]
+                s, t = accumulate_sit_stand_seconds(day_rows, day_locks, int(stand_threshold_mm), day_end)
+            else:
+                s, t = 0, 0
+            rows_to_write.append((ds, s, t, now))
+        if rows_to_write:
+            # One transaction for all days instead of a commit per day
+            with _write(conn):
+                conn.executemany(_daily_upsert_sql, rows_to_write)
     except Exception:
         # Best-effort; ignore failures to avoid blocking UI
         return
@@ -455,11 +732,11 @@ def clear_daily_aggregates() -> None:
 
     This is used when the user requests a full recomputation of aggregates.
     """
+    _reset_today_checkpoint()
     path = db_path()
     try:
-        with sqlite3.connect(path) as conn:
+        with _write(_get_conn(path)) as conn:
             conn.execute("DELETE FROM daily_aggregates")
-            conn.commit()
     except Exception:
         # Non-fatal; caller may attempt to backfill anyway
         return
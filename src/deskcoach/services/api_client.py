@@ -2,18 +2,98 @@
 
 Expose a simple function get_height_mm(base_url) that returns the current
 height in millimeters, fetching JSON like {"table_height": 79} (cm).
-Includes a small retry loop and warning logs on failures.
+Includes a small retry loop and warning logs on failures. Connections are kept
+alive between calls through one shared client per base URL.
 """
 from __future__ import annotations
 
+import atexit
 import logging
+import random
+import threading
 import time
 from typing import Any
 
 import httpx
+from httpx import ConnectError, ConnectTimeout, HTTPStatusError, TransportError
 
 log = logging.getLogger(__name__)
 
+# One keep-alive client per base URL, so polls after the first skip the TCP setup
+_CLIENTS: dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+# Failed connection attempts are retried by the transport itself (immediately,
+# before any request byte is sent); get_height_mm only retries the rest
+_CONNECT_RETRIES = 2
+_KEEPALIVE_MAX = 4
+_CONNECTIONS_MAX = 8
+
+
+def _get_client(base_url: str, timeout: float) -> httpx.Client:
+    """Return the shared client for base_url, creating it on first use."""
+    with _clients_lock:
+        client = _CLIENTS.get(base_url)
+        if client is None:
+            transport = httpx.HTTPTransport(
+                retries=_CONNECT_RETRIES,
+                limits=httpx.Limits(max_keepalive_connections=_KEEPALIVE_MAX, max_connections=_CONNECTIONS_MAX),
+            )
+            client = httpx.Client(timeout=timeout, transport=transport)
+            _CLIENTS[base_url] = client
+        return client
+
+
+def close_clients() -> None:
+    """Close all shared clients (registered with atexit)."""
+    with _clients_lock:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:  # pragma: no cover - shutdown best effort
+            log.debug("Closing HTTP client failed: %s", e)
+
+
+atexit.register(close_clients)
+
+# Truncated exponential backoff between attempts: full jitter over [0, min(cap, base * 2**n)]
+_BACKOFF_BASE_SEC = 0.25
+_BACKOFF_CAP_SEC = 4.0
+
+
+def _is_transient(err: Exception) -> bool:
+    """True for errors worth retrying here: read/write failures, timeouts and 5xx responses.
+
+    Connection failures are not: the transport already retried those.
+    """
+    if isinstance(err, HTTPStatusError):
+        return err.response.status_code >= 500
+    return isinstance(err, TransportError) and not isinstance(err, (ConnectError, ConnectTimeout))
+
+
+def _cm_to_mm(cm: Any) -> int:
+    """Convert a table_height value (centimeters; int, float or numeric str) to millimeters."""
+    if type(cm) is int:  # the usual case; bool is excluded on purpose
+        return cm * 10
+    if isinstance(cm, str) and "." not in cm and "e" not in cm.lower():
+        return int(cm) * 10
+    return int(round(float(cm) * 10))
+
+
+def _backoff_sec(attempt: int) -> float:
+    return random.uniform(0, min(_BACKOFF_CAP_SEC, _BACKOFF_BASE_SEC * 2**attempt))
+
+
+def _parse_height(resp: Any) -> int:
+    """Height in mm from a table-height response; raises on HTTP or schema errors."""
+    resp.raise_for_status()
+    data: dict[str, Any] = resp.json()  # type: ignore[assignment]
+    # Expected key "table_height" expressed in centimeters
+    if "table_height" not in data:
+        raise KeyError("Missing 'table_height' in response JSON")
+    return _cm_to_mm(data["table_height"])
+
 
 def get_height_mm(base_url: str, *, timeout: float = 5.0, retries: int = 2) -> int:
     """Fetch current desk height in millimeters.
@@ -25,7 +105,10 @@ def get_height_mm(base_url: str, *, timeout: float = 5.0, retries: int = 2) -> i
     timeout: float
         Request timeout in seconds.
     retries: int
-        Number of quick retries after the first attempt (total attempts = 1 + retries).
+        Number of retries after the first attempt (total attempts = 1 + retries).
+        Only transient errors (dropped connections, timeouts, 5xx) are retried,
+        with jittered exponential backoff in between. Failures to connect are
+        retried by the shared client's transport instead.
 
     Returns
     -------
@@ -41,24 +124,16 @@ def get_height_mm(base_url: str, *, timeout: float = 5.0, retries: int = 2) -> i
 
     for attempt in range(1 + retries):
         try:
-            with httpx.Client(timeout=timeout) as client:
-                resp = client.get(url)
-                resp.raise_for_status()
-                data: dict[str, Any] = resp.json()  # type: ignore[assignment]
-                # Expected key "table_height" expressed in centimeters
-                if "table_height" not in data:
-                    raise KeyError("Missing 'table_height' in response JSON")
-                cm = float(data["table_height"])  # may be int or float
-                mm = int(round(cm * 10))  # convert centimeters to millimeters
-                return mm
+            return _parse_height(_get_client(base_url, timeout).get(url, timeout=timeout))
         except Exception as e:  # broad to log and retry
             last_err = e
-            if attempt < retries:
+            if attempt < retries and _is_transient(e):
                 log.warning("API call failed (attempt %s/%s): %s", attempt + 1, 1 + retries, e)
-                time.sleep(0.5)
+                time.sleep(_backoff_sec(attempt))
             else:
                 break
 
     assert last_err is not None
-    log.warning("API call failed after %s attempts: %s", 1 + retries, last_err)
+    log.warning("API call failed after %s attempts: %s", attempt + 1, last_err)
     raise RuntimeError(f"Failed to fetch height from {url}: {last_err}")
+
@@ -8,20 +8,48 @@ anymore. Falls back to stderr if no tray is present.
 from __future__ import annotations
 
 import sys
+from typing import Callable
 
+try:
+    from PyQt6.QtWidgets import QSystemTrayIcon  # type: ignore
+except Exception:  # pragma: no cover - PyQt missing or broken: stderr only
+    QSystemTrayIcon = None  # type: ignore[assignment,misc]
 
-def notify(title: str, message: str) -> None:
-    """Show a notification using the tray if available, else stderr. Never raises."""
-    # Try the existing tray icon, if main assigned notifier.tray = tray
+# The app's tray icon, registered by main via set_tray()
+_TRAY = None
+# notify()'s resolved delivery function; None until the first notify() after set_tray()
+_BACKEND: Callable[[str, str], None] | None = None
+
+
+def set_tray(tray: object) -> None:
+    """Use tray (a QSystemTrayIcon) for notifications; None reverts to stderr."""
+    global _TRAY, _BACKEND
+    _TRAY = tray
+    _BACKEND = None
+
+
+def _notify_stderr(title: str, message: str) -> None:
+    print(f"[Notification] {title}: {message}", file=sys.stderr)
+
+
+def _resolve_backend() -> Callable[[str, str], None]:
+    tray = _TRAY
     try:
-        from PyQt6.QtWidgets import QSystemTrayIcon  # type: ignore
-        tray = globals().get("tray")
-        if isinstance(tray, QSystemTrayIcon):
-            tray.showMessage(title, message)
-            return
+        if QSystemTrayIcon is not None and isinstance(tray, QSystemTrayIcon):
+            return tray.showMessage
     except Exception:
-        # Ignore PyQt import or usage issues and fall back
         pass
+    return _notify_stderr
 
-    # Final fallback: print to stderr
-    print(f"[Notification] {title}: {message}", file=sys.stderr)
+
+def notify(title: str, message: str) -> None:
+    """Show a notification using the tray if available, else stderr. Never raises."""
+    global _BACKEND
+    backend = _BACKEND
+    if backend is None:
+        backend = _BACKEND = _resolve_backend()
+    try:
+        backend(title, message)
+    except Exception:
+        # Ignore PyQt usage issues and fall back
+        _notify_stderr(title, message)
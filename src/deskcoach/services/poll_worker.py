@@ -0,0 +1,59 @@
+"""Background height polling for the Qt event loop.
+
+Runs the blocking HTTP request from api_client on a QThreadPool worker and
+reports the result through Qt signals. Signals connected from the GUI thread
+are delivered there, so slots may touch widgets and the reminder engine.
+Database work for a new sample can run on the worker too (see on_sample).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Optional
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+try:
+    from . import api_client
+except Exception:  # pragma: no cover
+    from deskcoach.services import api_client  # type: ignore
+
+log = logging.getLogger(__name__)
+
+
+class PollSignals(QObject):
+    """Signals emitted by HeightPollTask (create on the GUI thread)."""
+
+    measured = pyqtSignal(int, int)  # ts, height_mm
+    failed = pyqtSignal(str)
+
+
+class HeightPollTask(QRunnable):
+    """One height request; emits `measured` or `failed` on the given signals.
+
+    on_sample(ts, height_mm), if given, runs on the worker thread before
+    `measured` is emitted (e.g. to store the sample); if it raises, `failed`
+    is emitted instead.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        signals: PollSignals,
+        on_sample: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        super().__init__()
+        self._base_url = base_url
+        self._signals = signals
+        self._on_sample = on_sample
+
+    def run(self) -> None:
+        try:
+            height_mm = int(api_client.get_height_mm(self._base_url))
+            ts = time.time_ns() // 1_000_000_000
+            if self._on_sample is not None:
+                self._on_sample(ts, height_mm)
+        except Exception as e:
+            self._signals.failed.emit(str(e))
+            return
+        self._signals.measured.emit(ts, height_mm)
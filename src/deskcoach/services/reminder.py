@@ -5,7 +5,7 @@ import sqlite3
 import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
 from PyQt6.QtCore import QObject
 
@@ -19,6 +19,37 @@ except Exception:  # pragma: no cover
 
 log = logging.getLogger(__name__)
 
+# Samples closer together than this, with the same posture, are evaluated once
+_MIN_PROCESS_INTERVAL_SEC = 15
+
+# Where the current seated and standing runs started as of :now: the oldest
+# sample after the newest one of the other posture
+_streak_bounds_sql = """
+    WITH last_standing AS (
+        SELECT COALESCE(
+            (SELECT ts FROM measurements WHERE ts <= :now AND height_mm >= :thr ORDER BY ts DESC LIMIT 1), -1
+        ) AS ts
+    ),
+    last_seated AS (
+        SELECT COALESCE(
+            (SELECT ts FROM measurements WHERE ts <= :now AND height_mm < :thr ORDER BY ts DESC LIMIT 1), -1
+        ) AS ts
+    )
+    SELECT
+        (SELECT MIN(ts) FROM measurements WHERE ts <= :now AND ts > (SELECT ts FROM last_standing)),
+        (SELECT MIN(ts) FROM measurements WHERE ts <= :now AND ts > (SELECT ts FROM last_seated))
+"""
+# Newest UNLOCK that ended a LOCK of at least :lock_sec seconds; one statement,
+# and both the UNLOCK walk and the per-UNLOCK LOCK lookup seek
+# idx_session_events_event_ts
+_long_unlock_sql = """
+    SELECT u.ts FROM session_events u
+    WHERE u.event = :unlock AND u.ts - (
+        SELECT MAX(l.ts) FROM session_events l WHERE l.event = :lock AND l.ts <= u.ts
+    ) >= :lock_sec
+    ORDER BY u.ts DESC LIMIT 1
+"""
+
 
 @dataclass
 class ReminderConfig:
@@ -31,31 +62,67 @@ class ReminderConfig:
     lock_reset_threshold_minutes: int
 
 
+def _reminder_config_from(cfg: object) -> ReminderConfig:
+    # Pull values from cfg (AppConfig or any object with the same attributes)
+    return ReminderConfig(
+        stand_threshold_mm=int(getattr(cfg, "stand_threshold_mm", 900)),
+        remind_after_minutes=int(getattr(cfg, "remind_after_minutes", 45)),
+        remind_repeat_minutes=int(getattr(cfg, "remind_repeat_minutes", 5)),
+        snooze_minutes=int(getattr(cfg, "snooze_minutes", 30)),
+        standing_check_after_minutes=int(getattr(cfg, "standing_check_after_minutes", 30)),
+        standing_check_repeat_minutes=int(getattr(cfg, "standing_check_repeat_minutes", 30)),
+        lock_reset_threshold_minutes=int(getattr(cfg, "lock_reset_threshold_minutes", 5)),
+    )
+
+
 class ReminderEngine(QObject):
     """Reminder logic driven by new measurements.
 
     Call on_new_measurement(ts, height_mm) after each saved measurement.
+    seated_streak_fn/standing_streak_fn, if given, replace the DB-backed streak
+    calculators: (now_ts, latest_height) -> minutes. notify(title, message), if
+    given, is called instead of services.notifier.notify.
     """
 
-    def __init__(self, cfg: object, session_watcher: object) -> None:
+    def __init__(
+        self,
+        cfg: object,
+        session_watcher: object,
+        *,
+        seated_streak_fn: Optional[Callable[[int, int], int]] = None,
+        standing_streak_fn: Optional[Callable[[int, int], int]] = None,
+        notify: Optional[Callable[[str, str], None]] = None,
+    ) -> None:
         super().__init__()
-        # Pull values from cfg (SimpleNamespace-like)
-        self.cfg = ReminderConfig(
-            stand_threshold_mm=int(getattr(cfg, "stand_threshold_mm", 900)),
-            remind_after_minutes=int(getattr(cfg, "remind_after_minutes", 45)),
-            remind_repeat_minutes=int(getattr(cfg, "remind_repeat_minutes", 5)),
-            snooze_minutes=int(getattr(cfg, "snooze_minutes", 30)),
-            standing_check_after_minutes=int(getattr(cfg, "standing_check_after_minutes", 30)),
-            standing_check_repeat_minutes=int(getattr(cfg, "standing_check_repeat_minutes", 30)),
-            lock_reset_threshold_minutes=int(getattr(cfg, "lock_reset_threshold_minutes", 5)),
-        )
-        self._snoozed_until: Optional[datetime] = None
-        self._next_ready_at: Optional[datetime] = None
+        self.cfg = _reminder_config_from(cfg)
+        if seated_streak_fn is not None:
+            self._compute_seated_streak_minutes = seated_streak_fn  # type: ignore[method-assign]
+        if standing_streak_fn is not None:
+            self._compute_standing_streak_minutes = standing_streak_fn  # type: ignore[method-assign]
+        # None: look up notifier.notify per call, so a tray registered later is used
+        self._notify = notify
+        # Deadlines and the lock start are time.monotonic() seconds
+        self._snoozed_until: Optional[float] = None
+        self._next_ready_at: Optional[float] = None
         # Separate cadence for standing-checks
-        self._next_ready_standing: Optional[datetime] = None
-        self._next_ready_seated: Optional[datetime] = None
+        self._next_ready_standing: Optional[float] = None
+        self._next_ready_seated: Optional[float] = None
         self._session = session_watcher
-        self._lock_started_at: Optional[datetime] = None
+        self._lock_started_at: Optional[float] = None
+        # (threshold minutes, result) of the last long-lock lookup; only a new
+        # LOCK/UNLOCK can change it, so the lock handlers clear it
+        self._cached_lu_ts: Optional[tuple[int, Optional[int]]] = None
+        # (standing, since ts) of the current run; a sample of the same posture
+        # can't move its start, so the streak query runs again only after a
+        # posture change (or a lock, or new settings)
+        self._run_start: Optional[tuple[bool, int]] = None
+        # Bumped whenever the caches above are dropped; a lookup that started
+        # before (e.g. in prefetch on the poll thread) then doesn't store its result
+        self._cache_gen = 0
+        # (ts, standing) of the last evaluated measurement, for the debounce in on_new_measurement
+        self._last_processed: Optional[tuple[int, bool]] = None
+        # Minutes until the current posture's reminder threshold, as of the last measurement
+        self._minutes_until_due: Optional[int] = None
         # Connect to lock/unlock to pause countdowns
         try:
             session_watcher.session_locked.connect(self._on_locked)  # type: ignore[attr-defined]
@@ -63,24 +130,58 @@ class ReminderEngine(QObject):
         except Exception:  # pragma: no cover
             pass
 
+    def update_config(self, cfg: object) -> None:
+        """Re-read thresholds from cfg (e.g. after the settings dialog saved)."""
+        self.cfg = _reminder_config_from(cfg)
+        self._drop_caches()
+        self._last_processed = None  # re-evaluate the next sample against the new thresholds
+
     def is_snoozed(self) -> bool:
-        if self._snoozed_until is None:
-            return False
-        return datetime.now() < self._snoozed_until
+        return self._snoozed_until is not None and time.monotonic() < self._snoozed_until
 
     def snooze(self, minutes: Optional[int] = None) -> None:
         mins = int(minutes if minutes is not None else self.cfg.snooze_minutes)
-        self._snoozed_until = datetime.now() + timedelta(minutes=mins)
-        log.info("Snoozed reminders for %s minutes (until %s)", mins, self._snoozed_until.strftime("%H:%M"))
+        self._snoozed_until = time.monotonic() + mins * 60
+        # Wall-clock time only for the log line
+        until = datetime.now() + timedelta(minutes=mins)
+        log.info("Snoozed reminders for %s minutes (until %s)", mins, until.strftime("%H:%M"))
+
+    def minutes_until_due(self) -> Optional[int]:
+        """Minutes until the current streak reaches its reminder threshold (None before any data).
+
+        Based on the most recent measurement; 0 once a reminder is already due.
+        """
+        return self._minutes_until_due
+
+    def prefetch(self, ts: int, height_mm: int) -> None:
+        """Run the DB lookups on_new_measurement(ts, height_mm) needs and cache the results.
+
+        Meant for the poll worker thread, so the GUI thread finds them cached.
+        """
+        try:
+            self._run_since(ts, standing=height_mm >= self.cfg.stand_threshold_mm)
+            self._last_long_lock_unlock_ts(self.cfg.lock_reset_threshold_minutes)
+        except Exception as e:  # pragma: no cover - defensive
+            log.debug("Reminder prefetch failed: %s", e)
+
+    def _send(self, title: str, message: str) -> None:
+        (self._notify or notifier.notify)(title, message)
+
+    def _drop_caches(self) -> None:
+        self._cache_gen += 1
+        self._cached_lu_ts = None
+        self._run_start = None
 
     # Lock handling: pause countdowns while locked
     def _on_locked(self) -> None:
-        self._lock_started_at = datetime.now()
+        self._drop_caches()
+        self._lock_started_at = time.monotonic()
 
     def _on_unlocked(self) -> None:
+        self._drop_caches()
         if self._lock_started_at is None:
             return
-        delta = datetime.now() - self._lock_started_at
+        delta = time.monotonic() - self._lock_started_at
         self._lock_started_at = None
         # Extend snooze and next_ready by lock duration to effectively pause them
         if self._snoozed_until is not None:
@@ -93,94 +194,79 @@ class ReminderEngine(QObject):
             self._next_ready_seated += delta
 
     def _db_conn(self) -> sqlite3.Connection:
-        path = store.db_path()  # type: ignore[attr-defined]
-        return sqlite3.connect(path)
+        # The store's long-lived connection for this thread (prepared statements included)
+        return store.read_connection()
 
     def _last_long_lock_unlock_ts(self, threshold_minutes: int) -> Optional[int]:
         """Return the ts of the most recent UNLOCK whose preceding LOCK lasted >= threshold.
 
-        This scans backwards over recent UNLOCK events until it finds one
-        that follows a long enough LOCK. If none exists, returns None.
+        Returns None if there is none. The result is kept until the next
+        lock/unlock signal.
         """
-        threshold_sec = int(max(0, threshold_minutes)) * 60
+        threshold_minutes = int(threshold_minutes)
+        cached = self._cached_lu_ts
+        if cached is not None and cached[0] == threshold_minutes:
+            return cached[1]
+        gen = self._cache_gen
         try:
-            with self._db_conn() as conn:
-                # Iterate over recent UNLOCK events from newest to oldest
-                cur = conn.execute(
-                    "SELECT ts FROM session_events WHERE event='UNLOCK' ORDER BY ts DESC LIMIT 2000"
-                )
-                for (unlock_ts_val,) in cur:
-                    unlock_ts = int(unlock_ts_val)
-                    row2 = conn.execute(
-                        "SELECT ts FROM session_events WHERE event='LOCK' AND ts <= ? ORDER BY ts DESC LIMIT 1",
-                        (unlock_ts,),
-                    ).fetchone()
-                    if not row2:
-                        continue
-                    lock_ts = int(row2[0])
-                    if unlock_ts - lock_ts >= threshold_sec:
-                        return unlock_ts
+            row = self._db_conn().execute(
+                _long_unlock_sql,
+                {
+                    "unlock": store.EVENT_UNLOCK,
+                    "lock": store.EVENT_LOCK,
+                    "lock_sec": max(0, threshold_minutes) * 60,
+                },
+            ).fetchone()
         except Exception as e:  # pragma: no cover - defensive
             log.debug("DB session_events query failed: %s", e)
-        return None
+            return None
+        lu_ts = row[0] if row else None
+        if gen == self._cache_gen:
+            self._cached_lu_ts = (threshold_minutes, lu_ts)
+        return lu_ts
 
-    def _compute_seated_streak_minutes(self, now_ts: int, latest_height: int) -> int:
-        threshold = self.cfg.stand_threshold_mm
-        if latest_height >= threshold:
-            return 0
-        last_ts = now_ts
-        # Walk backwards until we hit a standing sample
+    def _streak_bounds(self, now_ts: int) -> tuple[Optional[int], Optional[int]]:
+        """Return (seated since, standing since) as of now_ts; None where there is no such run."""
         try:
-            with self._db_conn() as conn:
-                cur = conn.execute(
-                    "SELECT ts, height_mm FROM measurements ORDER BY ts DESC LIMIT 1000"
-                )
-                for row in cur:
-                    ts, height_mm = int(row[0]), int(row[1])
-                    if height_mm >= threshold:
-                        # Found standing sample boundary
-                        break
-                    last_ts = ts
+            row = self._db_conn().execute(
+                _streak_bounds_sql, {"now": now_ts, "thr": self.cfg.stand_threshold_mm}
+            ).fetchone()
+            return row[0], row[1]
         except Exception as e:  # pragma: no cover - don't break app on DB issues
             log.debug("DB streak query failed: %s", e)
-        # Apply lock reset threshold: if there was a long lock, streak can't start before last unlock
-        try:
-            lu_ts = self._last_long_lock_unlock_ts(self.cfg.lock_reset_threshold_minutes)
-            if lu_ts is not None and lu_ts > last_ts:
-                last_ts = lu_ts
-        except Exception:
-            pass
-        streak_sec = max(0, now_ts - last_ts)
-        return streak_sec // 60
+            return None, None
 
-    def _compute_standing_streak_minutes(self, now_ts: int, latest_height: int) -> int:
-        threshold = self.cfg.stand_threshold_mm
-        if latest_height < threshold:
+    def _run_since(self, now_ts: int, standing: bool) -> Optional[int]:
+        """Return when the current seated/standing run started, querying only on a posture change."""
+        cached = self._run_start
+        if cached is not None and cached[0] == standing and cached[1] <= now_ts:
+            return cached[1]
+        gen = self._cache_gen
+        seated_since, standing_since = self._streak_bounds(now_ts)
+        since = standing_since if standing else seated_since
+        if gen == self._cache_gen:
+            self._run_start = (standing, since) if since is not None else None
+        return since
+
+    def _compute_streak_minutes(self, now_ts: int, latest_height: int, standing: bool) -> int:
+        """Minutes of the current standing (or seated) run; 0 if latest_height is the other posture."""
+        if (latest_height >= self.cfg.stand_threshold_mm) != standing:
             return 0
-        last_ts = now_ts
-        try:
-            with self._db_conn() as conn:
-                cur = conn.execute(
-                    "SELECT ts, height_mm FROM measurements ORDER BY ts DESC LIMIT 1000"
-                )
-                for row in cur:
-                    ts, height_mm = int(row[0]), int(row[1])
-                    if height_mm < threshold:
-                        # Found seated sample boundary
-                        break
-                    last_ts = ts
-        except Exception as e:
-            log.debug("DB standing streak query failed: %s", e)
+        since = self._run_since(now_ts, standing)
+        last_ts = since if since is not None else now_ts
+        lu_ts = self._last_long_lock_unlock_ts(self.cfg.lock_reset_threshold_minutes)
         # Apply lock reset threshold: if there was a long lock, streak can't start before last unlock
-        try:
-            lu_ts = self._last_long_lock_unlock_ts(self.cfg.lock_reset_threshold_minutes)
-            if lu_ts is not None and lu_ts > last_ts:
-                last_ts = lu_ts
-        except Exception:
-            pass
+        if lu_ts is not None and lu_ts > last_ts:
+            last_ts = lu_ts
         streak_sec = max(0, now_ts - last_ts)
         return streak_sec // 60
 
+    def _compute_seated_streak_minutes(self, now_ts: int, latest_height: int) -> int:
+        return self._compute_streak_minutes(now_ts, latest_height, standing=False)
+
+    def _compute_standing_streak_minutes(self, now_ts: int, latest_height: int) -> int:
+        return self._compute_streak_minutes(now_ts, latest_height, standing=True)
+
     def on_new_measurement(self, ts: int, height_mm: int) -> None:
         """Evaluate reminder conditions upon receiving a new measurement.
         ts is expected to be an integer unix timestamp (seconds).
@@ -195,9 +281,19 @@ class ReminderEngine(QObject):
                 return
 
             threshold = self.cfg.stand_threshold_mm
+            is_standing = height_mm >= threshold
+            # A burst of samples in one posture can't change much; evaluate the first one
+            last = self._last_processed
+            if last is not None and last[1] == is_standing and 0 <= ts - last[0] < _MIN_PROCESS_INTERVAL_SEC:
+                return
+            self._last_processed = (ts, is_standing)
+
             seated_streak_min = self._compute_seated_streak_minutes(ts, height_mm)
             standing_streak_min = self._compute_standing_streak_minutes(ts, height_mm)
-            is_standing = height_mm >= threshold
+            if is_standing:
+                self._minutes_until_due = max(0, self.cfg.standing_check_after_minutes - standing_streak_min)
+            else:
+                self._minutes_until_due = max(0, self.cfg.remind_after_minutes - seated_streak_min)
 
             # Reset cadence when switching posture
             if is_standing:
@@ -210,27 +306,27 @@ class ReminderEngine(QObject):
             if self.is_snoozed():
                 return
 
-            now = datetime.now()
+            now = time.monotonic()
 
             # Seated too long -> remind to stand up
             if not is_standing and seated_streak_min >= self.cfg.remind_after_minutes:
                 if self._next_ready_seated is None or now >= self._next_ready_seated:
                     try:
-                        notifier.notify("Stand up", f"You've been seated for {seated_streak_min} min.")
+                        self._send("Stand up", f"You've been seated for {seated_streak_min} min.")
                     except Exception as e:  # pragma: no cover - ensure no crash
                         log.debug("notify() failed: %s", e)
-                    self._next_ready_seated = now + timedelta(minutes=self.cfg.remind_repeat_minutes)
+                    self._next_ready_seated = now + self.cfg.remind_repeat_minutes * 60
 
             # Standing for a long time -> posture check
             if is_standing and standing_streak_min >= self.cfg.standing_check_after_minutes:
                 if self._next_ready_standing is None or now >= self._next_ready_standing:
                     try:
-                        notifier.notify(
+                        self._send(
                             "Posture check",
                             "You've been standing for a while. Are you still in a good standing position, or slipping into a protective posture?",
                         )
                     except Exception as e:  # pragma: no cover - ensure no crash
                         log.debug("notify() failed: %s", e)
-                    self._next_ready_standing = now + timedelta(minutes=self.cfg.standing_check_repeat_minutes)
+                    self._next_ready_standing = now + self.cfg.standing_check_repeat_minutes * 60
         except Exception as e:  # pragma: no cover - defensive
             log.debug("ReminderEngine error: %s", e)
@@ -4,6 +4,7 @@ import sys
 import ctypes
 import logging
 import weakref
+from collections import deque
 from datetime import datetime
 from typing import Optional
 
@@ -56,6 +57,11 @@ try:
 except Exception:
     wintypes = None  # type: ignore
 
+# Resolved once: the native event filter sees every message the app receives
+_MSG_STRUCT = wintypes.MSG if sys.platform.startswith("win") and wintypes is not None else None  # type: ignore[attr-defined]
+_NATIVE_MSG_TYPES = (b"windows_generic_MSG", b"windows_dispatcher_MSG")
+_WATCHED_MESSAGES = frozenset((WM_WTSSESSION_CHANGE, WM_QUERYENDSESSION, WM_ENDSESSION, WM_POWERBROADCAST))
+
 if sys.platform.startswith("win") and wintypes is not None:
     user32 = ctypes.windll.user32  # type: ignore[attr-defined]
     wtsapi32 = ctypes.windll.wtsapi32  # type: ignore[attr-defined]
@@ -153,14 +159,13 @@ class _NativeFilter(QAbstractNativeEventFilter):
         self._owner = owner
 
     def nativeEventFilter(self, eventType: bytes, message: int) -> tuple[bool, int]:  # type: ignore[override]
-        if not sys.platform.startswith("win") or wintypes is None:
+        if _MSG_STRUCT is None or eventType not in _NATIVE_MSG_TYPES:
             return False, 0
         try:
-            if eventType not in (b"windows_generic_MSG", b"windows_dispatcher_MSG"):
+            # message is a pointer to MSG; most messages (input, paint, timers) stop here
+            msg = _MSG_STRUCT.from_address(int(message))
+            if msg.message not in _WATCHED_MESSAGES:
                 return False, 0
-            # message is a pointer to MSG
-            MSG = wintypes.MSG  # type: ignore[attr-defined]
-            msg = MSG.from_address(int(message))
             if msg.message == WM_WTSSESSION_CHANGE:
                 reason = int(msg.wParam)
                 session_id = int(msg.lParam)
@@ -217,6 +222,8 @@ class SessionWatcher(QObject):
         self._wts_registered: bool = False
         self._poll_timer = None
         self._filter = _NativeFilter(self)
+        # LOCK/UNLOCK rows waiting to be written (see _persist_event)
+        self._pending_events: deque[tuple[int, str]] = deque()
 
         # If not on Windows or WTS/ctypes not available, treat as always unlocked and return early.
         if not sys.platform.startswith("win"):
@@ -402,19 +409,13 @@ class SessionWatcher(QObject):
         try:
             ts = int(datetime.now().timestamp())
             if self._unlocked:
-                try:
-                    if persist and store is not None:
-                        store.save_session_event(ts, "UNLOCK")  # type: ignore[attr-defined]
-                except Exception:
-                    pass
+                if persist:
+                    self._persist_event(ts, "UNLOCK")
                 log.info("Emitting initial UNLOCK state event")
                 self.session_unlocked.emit()
             else:
-                try:
-                    if persist and store is not None:
-                        store.save_session_event(ts, "LOCK")  # type: ignore[attr-defined]
-                except Exception:
-                    pass
+                if persist:
+                    self._persist_event(ts, "LOCK")
                 log.info("Emitting initial LOCK state event")
                 self.session_locked.emit()
         except Exception as e:  # pragma: no cover
@@ -536,13 +537,7 @@ class SessionWatcher(QObject):
             return
         self._unlocked = False
         self._lock_changed_at = datetime.now()
-        # Persist event
-        try:
-            if store is not None:
-                ts = int(self._lock_changed_at.timestamp())
-                store.save_session_event(ts, "LOCK")  # type: ignore[attr-defined]
-        except Exception as e:  # pragma: no cover
-            log.debug("Failed to save LOCK event: %s", e)
+        self._persist_event(int(self._lock_changed_at.timestamp()), "LOCK")
         log.info("Session locked (local console): pausing polling and reminders.")
         self.session_locked.emit()
 
@@ -551,17 +546,47 @@ class SessionWatcher(QObject):
             return
         self._unlocked = True
         self._lock_changed_at = datetime.now()
-        # Persist event
-        try:
-            if store is not None:
-                ts = int(self._lock_changed_at.timestamp())
-                store.save_session_event(ts, "UNLOCK")  # type: ignore[attr-defined]
-        except Exception as e:  # pragma: no cover
-            log.debug("Failed to save UNLOCK event: %s", e)
+        self._persist_event(int(self._lock_changed_at.timestamp()), "UNLOCK")
         log.info("Session unlocked (local console): resuming polling and reminders.")
         self.session_unlocked.emit()
 
+    def _persist_event(self, ts: int, event: str) -> None:
+        """Queue a session event for the store.
+
+        The queue is written in one transaction on the next event-loop pass,
+        so a burst of transitions (RDP reconnect, suspend/resume) costs one
+        write and the native message handler never waits on the disk.
+        """
+        if store is None:
+            return
+        schedule = not self._pending_events
+        self._pending_events.append((ts, event))
+        if not schedule:
+            return
+        try:
+            if QCoreApplication.instance() is None:
+                raise RuntimeError("no event loop")
+            from PyQt6.QtCore import QTimer
+            QTimer.singleShot(0, self.flush_events)
+        except Exception:
+            self.flush_events()
+
+    def flush_events(self) -> None:
+        """Write queued session events now (also called by the app on quit)."""
+        if not self._pending_events or store is None:
+            return
+        events = list(self._pending_events)
+        self._pending_events.clear()
+        try:
+            store.save_session_events(events)  # type: ignore[attr-defined]
+        except Exception as e:  # pragma: no cover
+            log.debug("Failed to save session events: %s", e)
+
     def __del__(self) -> None:  # pragma: no cover - cleanup best effort
+        try:
+            self.flush_events()
+        except Exception:
+            pass
         try:
             if getattr(self, "_unregistered", False):
                 return
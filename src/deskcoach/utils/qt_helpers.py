@@ -13,10 +13,41 @@ except Exception:
     qdarktheme = None  # type: ignore
 
 
+# DeskCoach additions on top of the PyQtDarkTheme stylesheet
+_ADDITIONAL_QSS = """
+QPushButton, QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTextEdit {
+    border-radius: 8px;
+    padding: 6px 10px;
+}
+QMenu::item { border-radius: 6px; padding: 6px 12px; }
 
-
-
-
+/* DeskCoach dashboard styles */
+QLabel[dc="date"] {
+    font-weight: 600;
+    font-size: 16px;
+}
+QLabel[dc="muted"] {
+    color: palette(mid);
+}
+QFrame[dc="card"] {
+    border-radius: 10px;
+    border: 1px solid palette(mid);
+}
+QLabel[dc="cardTitle"] { color: palette(mid); }
+QLabel[dc="value"] {
+    font-size: 28px;
+    font-weight: 700;
+    padding: 2px 0 6px 0;
+}
+QLabel[dc="pill"] {
+    padding: 3px 8px;
+    border-radius: 10px;
+    background: palette(button);
+    color: palette(button-text);
+}
+QLabel[dc="pill"][class="good"] { background: #2e7d32; color: white; }
+QLabel[dc="pill"][class="bad"]  { background: #c62828; color: white; }
+"""
 
 
 def apply_modern_style(app: QApplication, theme: str = "auto") -> None:
@@ -29,86 +60,13 @@ def apply_modern_style(app: QApplication, theme: str = "auto") -> None:
     # Apply PyQtDarkTheme (do not set Fusion or manual palettes/stylesheets)
     if qdarktheme is not None:
         if hasattr(qdarktheme, "setup_theme"):
-            qdarktheme.setup_theme(
-                theme=theme,
-                corner_shape="rounded",
-                additional_qss=(
-                    """
-                    QPushButton, QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTextEdit {
-                        border-radius: 8px;
-                        padding: 6px 10px;
-                    }
-                    QMenu::item { border-radius: 6px; padding: 6px 12px; }
-
-                    /* DeskCoach dashboard styles */
-                    QLabel[dc="date"] {
-                        font-weight: 600;
-                        font-size: 16px;
-                    }
-                    QLabel[dc="muted"] {
-                        color: palette(mid);
-                    }
-                    QFrame[dc="card"] {
-                        border-radius: 10px;
-                        border: 1px solid palette(mid);
-                    }
-                    QLabel[dc="cardTitle"] { color: palette(mid); }
-                    QLabel[dc="value"] {
-                        font-size: 28px;
-                        font-weight: 700;
-                        padding: 2px 0 6px 0;
-                    }
-                    QLabel[dc="pill"] {
-                        padding: 3px 8px;
-                        border-radius: 10px;
-                        background: palette(button);
-                        color: palette(button-text);
-                    }
-                    QLabel[dc="pill"][class="good"] { background: #2e7d32; color: white; }
-                    QLabel[dc="pill"][class="bad"]  { background: #c62828; color: white; }
-                    """
-                ),
-            )
+            qdarktheme.setup_theme(theme=theme, corner_shape="rounded", additional_qss=_ADDITIONAL_QSS)
         else:
             # Compatibility for PyQtDarkTheme < 2.0: use stylesheet string API if available
             try:
                 if hasattr(qdarktheme, "load_stylesheet"):
                     base_theme = theme if theme in ("dark", "light") else "dark"
-                    qss = qdarktheme.load_stylesheet(base_theme)
-                    qss += """
-                    QPushButton, QLineEdit, QSpinBox, QDoubleSpinBox, QComboBox, QTextEdit {
-                        border-radius: 8px;
-                        padding: 6px 10px;
-                    }
-                    QMenu::item { border-radius: 6px; padding: 6px 12px; }
-
-                    /* DeskCoach dashboard styles */
-                    QLabel[dc=\"date\"] {
-                        font-weight: 600;
-                        font-size: 16px;
-                    }
-                    QLabel[dc=\"muted\"] {
-                        color: palette(mid);
-                    }
-                    QFrame[dc=\"card\"] {
-                        border-radius: 10px;
-                        border: 1px solid palette(mid);
-                    }
-                    QLabel[dc=\"cardTitle\"] { color: palette(mid); }
-                    QLabel[dc=\"value\"] {
-                        font-size: 28px;
-                        font-weight: 700;
-                        padding: 2px 0 6px 0;
-                    }
-                    QLabel[dc=\"pill\"] {
-                        padding: 3px 8px;
-                        border-radius: 10px;
-                        background: palette(button);
-                        color: palette(button-text);
-                    }
-                    QLabel[dc=\"pill\"][class=\"good\"] { background: #2e7d32; color: white; }
-                    QLabel[dc=\"pill\"][class=\"bad\"]  { background: #c62828; color: white; }
-                    """
+                    qss = qdarktheme.load_stylesheet(base_theme) + _ADDITIONAL_QSS
                     try:
                         app.setStyleSheet(qss)
                     except Exception:
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from itertools import chain, islice
 from typing import Iterable, List, Sequence, Tuple
 
 # Types
@@ -9,6 +12,9 @@ Measurement = Tuple[int, int]
 # Lock intervals are half-open ranges [start_ts, end_ts)
 LockInterval = Tuple[int, int]
 
+# Longest stretch a single sample is credited with (see accumulate_sit_stand_seconds)
+DEFAULT_MAX_GAP_SEC = 900
+
 
 def format_stats_window(now: datetime, start_of_day_hour: int) -> tuple[str, str]:
     """Return main-window label/tooltip clarifying the active stats window."""
@@ -30,25 +36,49 @@ def format_stats_window(now: datetime, start_of_day_hour: int) -> tuple[str, str
     return label, tooltip
 
 
-def _overlap_len(a0: int, a1: int, b0: int, b1: int) -> int:
-    """Return the length of overlap between [a0, a1) and [b0, b1)."""
-    return max(0, min(a1, b1) - max(a0, b0))
+def canonicalize_locks(lock_intervals: Iterable[LockInterval]) -> List[LockInterval]:
+    """Return lock_intervals as sorted, disjoint [start, end) ranges.
+
+    Overlapping and touching intervals are merged into one; empty ones are dropped.
+    """
+    merged: List[LockInterval] = []
+    target: List[int] | None = None
+    for l0, l1 in sorted(lock_intervals):
+        if l1 <= l0:
+            continue
+        if target is not None and l0 <= target[1]:
+            if l1 > target[1]:
+                target[1] = l1
+            continue
+        if target is not None:
+            merged.append((target[0], target[1]))
+        target = [l0, l1]
+    if target is not None:
+        merged.append((target[0], target[1]))
+    return merged
+
 
+def _locked_before_fn(locks: Sequence[LockInterval]):
+    """Return locked_before(t): locked seconds before t within canonical locks (see canonicalize_locks).
 
-def _subtract_locked(seg_start: int, seg_end: int, lock_intervals: Sequence[LockInterval]) -> int:
-    """Given a segment [seg_start, seg_end), subtract any locked sub-intervals and
-    return the effective unlocked length. Assumes lock_intervals are within the
-    same broader window and can be unordered.
+    Uses a prefix sum of lock lengths, so each call is one bisect.
     """
-    length = max(0, seg_end - seg_start)
-    if length == 0 or not lock_intervals:
-        return length
-    cut = 0
-    for l0, l1 in lock_intervals:
-        cut += _overlap_len(seg_start, seg_end, l0, l1)
-        if cut >= length:
+    starts = [l0 for l0, _ in locks]
+    ends = [l1 for _, l1 in locks]
+    cov: List[int] = []
+    total = 0
+    for l0, l1 in locks:
+        total += l1 - l0
+        cov.append(total)
+
+    def locked_before(t: int) -> int:
+        k = bisect_right(starts, t) - 1
+        if k < 0:
             return 0
-    return max(0, length - cut)
+        base = cov[k - 1] if k > 0 else 0
+        return base + (ends[k] if ends[k] < t else t) - starts[k]
+
+    return locked_before
 
 
 def accumulate_sit_stand_seconds(
@@ -57,7 +87,7 @@ def accumulate_sit_stand_seconds(
     stand_threshold_mm: int,
     end_ts: int,
     *,
-    max_gap_sec: int = 900,
+    max_gap_sec: int = DEFAULT_MAX_GAP_SEC,
 ) -> Tuple[int, int]:
     """Accumulate seated and standing seconds for the provided measurements until end_ts.
 
@@ -72,7 +102,8 @@ def accumulate_sit_stand_seconds(
     ----------
     measurements: a sequence of (ts, height_mm), sorted ascending by ts. Duplicates and non-monotonic
                   sequences are tolerated (non-increasing steps are skipped).
-    lock_intervals: list of [start, end) timestamps during which time should be excluded.
+    lock_intervals: list of [start, end) timestamps during which time should be excluded; they may be
+                    unordered and overlap (overlaps are excluded once).
     stand_threshold_mm: height in mm at/above which a sample is considered standing.
     end_ts: inclusive window end boundary (tail interval ends at this timestamp).
     max_gap_sec: maximum number of seconds to attribute from a single sample forward. Any excess time
@@ -82,25 +113,71 @@ def accumulate_sit_stand_seconds(
     -------
     (seated_seconds, standing_seconds)
     """
-    if end_ts <= 0 or not measurements:
-        return 0, 0
+    ts = array("q", [m[0] for m in measurements])
+    heights = array("q", [m[1] for m in measurements])
+    lock_starts = array("q", [l[0] for l in lock_intervals])
+    lock_ends = array("q", [l[1] for l in lock_intervals])
+    return accumulate_sit_stand_seconds_arrays(
+        ts, heights, lock_starts, lock_ends, stand_threshold_mm, end_ts, max_gap_sec=max_gap_sec
+    )
+
 
+def _accum_no_locks(ts: Sequence[int], heights: Sequence[int], thr: int, end_ts: int, gap: int) -> Tuple[int, int]:
+    """accumulate_sit_stand_seconds_arrays when nothing is locked (gap 0 = uncapped)."""
     seated = 0
     standing = 0
+    for t0, h0, t1 in zip(ts, heights, chain(islice(ts, 1, None), (end_ts,))):
+        d = t1 - t0
+        if d <= 0:
+            continue
+        if gap and d > gap:
+            d = gap
+        if h0 >= thr:
+            standing += d
+        else:
+            seated += d
+    return seated, standing
+
+
+def accumulate_sit_stand_seconds_arrays(
+    ts: Sequence[int],
+    heights: Sequence[int],
+    lock_starts: Sequence[int],
+    lock_ends: Sequence[int],
+    stand_threshold_mm: int,
+    end_ts: int,
+    *,
+    max_gap_sec: int = DEFAULT_MAX_GAP_SEC,
+) -> Tuple[int, int]:
+    """accumulate_sit_stand_seconds over parallel columns instead of row tuples.
+
+    ts/heights are the sample columns and lock_starts/lock_ends the lock interval columns, typically
+    ``array('q')``; same rules and result as accumulate_sit_stand_seconds.
+    """
+    if end_ts <= 0 or not ts:
+        return 0, 0
+
     thr = int(stand_threshold_mm)
+    # Resolve the cap once; 0 means "uncapped"
+    gap = int(max_gap_sec) if max_gap_sec is not None and max_gap_sec > 0 else 0
+    if not lock_starts:
+        return _accum_no_locks(ts, heights, thr, end_ts, gap)
 
-    # Attribute consecutive sample intervals, capping attribution to max_gap_sec per segment
-    for i in range(len(measurements) - 1):
-        t0, h0 = measurements[i]
-        t1, _ = measurements[i + 1]
+    seated = 0
+    standing = 0
+    # Merged once into a prefix sum, so each segment's locked overlap costs two bisects
+    locked_before = _locked_before_fn(canonicalize_locks(zip(lock_starts, lock_ends)))
+
+    # Each sample owns the time until the next one; the last one until end_ts
+    # (the pure-Python form of diff(append(ts, end_ts)))
+    next_ts = chain(islice(ts, 1, None), (end_ts,))
+    for t0, h0, t1 in zip(ts, heights, next_ts):
         if t1 <= t0:
             continue
-        seg_end = t1
-        if max_gap_sec is not None and max_gap_sec > 0:
-            seg_end = min(seg_end, t0 + int(max_gap_sec))
-        if seg_end <= t0:
-            continue
-        effective = _subtract_locked(t0, seg_end, lock_intervals)
+        # Cap attribution to max_gap_sec per segment
+        if gap and t1 - t0 > gap:
+            t1 = t0 + gap
+        effective = (t1 - t0) - (locked_before(t1) - locked_before(t0))
         if effective <= 0:
             continue
         if h0 >= thr:
@@ -108,18 +185,4 @@ def accumulate_sit_stand_seconds(
         else:
             seated += effective
 
-    # Tail from last sample to end_ts (also capped by max_gap_sec)
-    last_ts, last_h = measurements[-1]
-    if end_ts > last_ts:
-        tail_end = end_ts
-        if max_gap_sec is not None and max_gap_sec > 0:
-            tail_end = min(tail_end, last_ts + int(max_gap_sec))
-        if tail_end > last_ts:
-            effective = _subtract_locked(last_ts, tail_end, lock_intervals)
-            if effective > 0:
-                if last_h >= thr:
-                    standing += effective
-                else:
-                    seated += effective
-
     return seated, standing
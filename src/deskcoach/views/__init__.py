@@ -1,4 +1,23 @@
-from .main_window import MainWindow
-from .settings_dialog import SettingsDialog
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .main_window import MainWindow
+    from .settings_dialog import SettingsDialog
 
 __all__ = ["MainWindow", "SettingsDialog"]
+
+# Exported name -> submodule; imported on first attribute access so that using one view
+# doesn't pay for the widget imports of the others
+_LAZY = {"MainWindow": ".main_window", "SettingsDialog": ".settings_dialog"}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from datetime import datetime
+import functools
+from dataclasses import astuple
+from datetime import datetime, timedelta
 from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QMessageBox
-from PyQt6.QtCore import QTimer, Qt
-from pathlib import Path
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, pyqtSignal
 
 # Optional widgets (not present in minimal test stubs)
 try:  # pragma: no cover - exercised by import tests
@@ -18,105 +19,131 @@ except Exception:  # pragma: no cover
     QProgressDialog = QWidget  # type: ignore
     QLabel = QWidget  # type: ignore
 
-from .settings_dialog import SettingsDialog
+# Minimal test stubs lack most of the widget API; probed once so the real-Qt setup
+# below runs without per-call exception handlers
+_QT_STUB = QLabel is QWidget or not hasattr(QLabel, "setAlignment")
+
 from ..models import store
 from ..utils.time_stats import format_stats_window
 
 
+@functools.lru_cache(maxsize=1024)
+def _fmt_minutes(minutes: int) -> str:
+    h, mm = divmod(minutes, 60)
+    return f"{h}h{mm:02d}"
+
+
+def _fmt_hm(seconds: int) -> str:
+    """Format seconds as e.g. '1h05' (floored to whole minutes)."""
+    return _fmt_minutes(max(0, int(seconds)) // 60)
+
+
+class _RecalcSignals(QObject):
+    """Completion signal of _RecalcJob (create on the GUI thread)."""
+
+    done = pyqtSignal()
+
+
+class _RecalcJob(QRunnable):
+    """Rebuild the daily aggregates on a pool thread, then emit signals.done."""
+
+    def __init__(self, stand_thr: int, day_start_hour: int, signals: _RecalcSignals) -> None:
+        super().__init__()
+        self._stand_thr = stand_thr
+        self._day_start_hour = day_start_hour
+        self._signals = signals
+
+    def run(self) -> None:
+        try:
+            store.clear_daily_aggregates()
+            store.backfill_past_aggregates(self._stand_thr, start_of_day_hour=self._day_start_hour)
+            store.update_daily_aggregates_now(self._stand_thr, start_of_day_hour=self._day_start_hour)
+        except Exception:
+            pass
+        finally:
+            self._signals.done.emit()
+
+
 class MainWindow(QMainWindow):
     """MainWindow extracted from main.py to live under views/.
 
     It shows a simple central widget with a button to open SettingsDialog.
     """
 
+    # Emitted with True when the window is shown and False when it is hidden
+    visibility_changed = pyqtSignal(bool)
+    # Emitted after the settings dialog saved and applied new values to the config
+    settings_applied = pyqtSignal()
+
     def __init__(self, cfg_ns) -> None:
         super().__init__()
         self.setWindowTitle("DeskCoach")
         self._cfg_ns = cfg_ns
+        # Settings read on every refresh; re-read after the settings dialog saved
+        self._stand_thr = self._read_stand_thr()
+        self._goal_mm = self._goal_minutes()
+        # Closing hides to the tray; main() turns this off when no tray is available
+        self.hide_on_close = True
         central = QWidget(self)
         v = QVBoxLayout(central)
 
         # Header with date and optional streak
         self._header = QWidget(central)
         header_layout = QHBoxLayout(self._header)
-        try:
-            header_layout.setContentsMargins(0, 0, 0, 0)
-        except Exception:
-            pass
         self._date_lbl = QLabel("Today", self._header)
-        try:
-            self._date_lbl.setProperty("dc", "date")
-        except Exception:
-            pass
         self._streak_lbl = QLabel("", self._header)
-        try:
+        if not _QT_STUB:
+            self._date_lbl.setProperty("dc", "date")
+            self._streak_lbl.setProperty("dc", "pill")
             self._streak_lbl.setVisible(False)
             self._streak_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            self._streak_lbl.setProperty("dc", "pill")
-        except Exception:
-            pass
-        try:
+            header_layout.setContentsMargins(0, 0, 0, 0)
             header_layout.addWidget(self._date_lbl)
             header_layout.addStretch(1)
             header_layout.addWidget(self._streak_lbl)
-        except Exception:
-            pass
         v.addWidget(self._header)
 
         # Active stats window (respects configurable start-of-day)
         self._stats_window_lbl = QLabel("", central)
-        try:
+        if not _QT_STUB:
             self._stats_window_lbl.setProperty("dc", "muted")
-        except Exception:
-            pass
         v.addWidget(self._stats_window_lbl)
 
         # Summary pill before cards
         self._summary_pill = QLabel("", central)
-        try:
-            self._summary_pill.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        if not _QT_STUB:
             self._summary_pill.setProperty("dc", "pill")
+            self._summary_pill.setAlignment(Qt.AlignmentFlag.AlignCenter)
             self._summary_pill.setVisible(False)
-        except Exception:
-            pass
         v.addWidget(self._summary_pill)
 
         # Cards row (Standing / Sitting)
         self._cards = QWidget(central)
         cards_layout = QHBoxLayout(self._cards)
-        try:
-            cards_layout.setContentsMargins(0, 0, 0, 0)
-        except Exception:
-            pass
         self._stand_card = self._create_stat_card(title="Standing")
         self._sit_card = self._create_stat_card(title="Sitting")
-        try:
+        if not _QT_STUB:
+            cards_layout.setContentsMargins(0, 0, 0, 0)
             cards_layout.addWidget(self._stand_card)
             cards_layout.addSpacing(8)
             cards_layout.addWidget(self._sit_card)
-        except Exception:
-            pass
         v.addWidget(self._cards)
 
         # Goal progress (standing time vs daily goal)
         self._goal_prog = QProgressBar(central)
-        try:
+        if not _QT_STUB:
             self._goal_prog.setMinimum(0)
             self._goal_prog.setMaximum(100)
             self._goal_prog.setValue(0)
             self._goal_prog.setTextVisible(True)
             self._goal_prog.setVisible(False)
-        except Exception:
-            pass
         v.addWidget(self._goal_prog)
 
         # Tip/message area
         self._tip_lbl = QLabel("", central)
-        try:
-            self._tip_lbl.setWordWrap(True)
+        if not _QT_STUB:
             self._tip_lbl.setProperty("dc", "muted")
-        except Exception:
-            pass
+            self._tip_lbl.setWordWrap(True)
         v.addWidget(self._tip_lbl)
 
         # Settings
@@ -139,6 +166,12 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(central)
 
+        # Inputs of the last render; refresh_stats skips the UI update while they are unchanged
+        self._last_refresh_state: tuple | None = None
+        # Yesterday's full-day totals keyed by (stats date, threshold, day start hour); they
+        # cannot change during the day, while today's come from the store's incremental checkpoint
+        self._yday_cache: tuple[tuple[str, int, int], tuple[int, int]] | None = None
+
         # Periodic refresh of stats
         self._stats_timer = QTimer(self)
         self._stats_timer.setInterval(60_000)  # 60s
@@ -148,8 +181,15 @@ class MainWindow(QMainWindow):
         self.refresh_stats()
 
     def open_settings(self) -> None:
+        from .settings_dialog import SettingsDialog  # only needed once the user asks for it
+
+        before = astuple(self._cfg_ns.app)
         dlg = SettingsDialog(self, self._cfg_ns)
-        dlg.exec()
+        # Saving without changing anything shouldn't make listeners re-apply everything
+        if dlg.exec() and astuple(self._cfg_ns.app) != before:
+            self._stand_thr = self._read_stand_thr()
+            self._goal_mm = self._goal_minutes()
+            self.settings_applied.emit()
 
     def open_data_folder(self) -> None:
         try:
@@ -162,59 +202,33 @@ class MainWindow(QMainWindow):
 
     def _create_stat_card(self, title: str) -> QWidget:
         w = QFrame(self)
-        try:
-            w.setFrameShape(QFrame.Shape.StyledPanel)
-            w.setProperty("dc", "card")
-        except Exception:
-            pass
         lay = QVBoxLayout(w)
-        try:
-            lay.setContentsMargins(12, 12, 12, 12)
-        except Exception:
-            pass
         title_lbl = QLabel(title, w)
-        try:
-            title_lbl.setProperty("dc", "cardTitle")
-        except Exception:
-            pass
         value_lbl = QLabel("—", w)
-        try:
-            value_lbl.setProperty("dc", "value")
-        except Exception:
-            pass
         subrow = QWidget(w)
         sublay = QHBoxLayout(subrow)
-        try:
-            sublay.setContentsMargins(0, 0, 0, 0)
-        except Exception:
-            pass
         trend_lbl = QLabel("", subrow)
-        try:
+        prog = QProgressBar(w)
+        if not _QT_STUB:
+            w.setFrameShape(QFrame.Shape.StyledPanel)
+            w.setProperty("dc", "card")
+            title_lbl.setProperty("dc", "cardTitle")
+            value_lbl.setProperty("dc", "value")
+            trend_lbl.setProperty("dc", "pill")
             trend_lbl.setVisible(False)
             trend_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            trend_lbl.setProperty("dc", "pill")
-        except Exception:
-            pass
-        try:
-            sublay.addWidget(trend_lbl)
-            sublay.addStretch(1)
-        except Exception:
-            pass
-        prog = QProgressBar(w)
-        try:
             prog.setMinimum(0)
             prog.setMaximum(100)
             prog.setValue(0)
             prog.setTextVisible(True)
-        except Exception:
-            pass
-        try:
+            lay.setContentsMargins(12, 12, 12, 12)
+            sublay.setContentsMargins(0, 0, 0, 0)
+            sublay.addWidget(trend_lbl)
+            sublay.addStretch(1)
             lay.addWidget(title_lbl)
             lay.addWidget(value_lbl)
             lay.addWidget(subrow)
             lay.addWidget(prog)
-        except Exception:
-            pass
         # Expose parts for refresh
         w.title_lbl = title_lbl  # type: ignore[attr-defined]
         w.value_lbl = value_lbl  # type: ignore[attr-defined]
@@ -222,10 +236,11 @@ class MainWindow(QMainWindow):
         w.progress = prog        # type: ignore[attr-defined]
         return w
 
-    def _fmt_hm(self, seconds: int) -> str:
-        m = max(0, int(seconds)) // 60
-        h, mm = divmod(m, 60)
-        return f"{h}h{mm:02d}"
+    def _read_stand_thr(self) -> int:
+        try:
+            return int(getattr(self._cfg_ns.app, "stand_threshold_mm", 900))
+        except Exception:
+            return 900
 
     def _goal_minutes(self) -> int:
         try:
@@ -269,19 +284,25 @@ class MainWindow(QMainWindow):
 
     def _apply_pill(self, lbl: QLabel, text: str, klass: str | None) -> None:
         try:
-            lbl.setText(text)
-            lbl.setVisible(bool(text))
-            # Tooltip to explain how comparison is computed
-            if text:
-                lbl.setToolTip(
-                    "Compared to yesterday (full day). Based on precomputed daily aggregates; "
-                    "no on-the-fly calculation. Session-locked time is excluded."
-                )
-            else:
-                lbl.setToolTip("")
-            lbl.setProperty("class", "")
-            if klass:
-                lbl.setProperty("class", klass)
+            # Text, visibility and tooltip only change together with the text
+            if text != lbl.text():
+                lbl.setText(text)
+                lbl.setVisible(bool(text))
+                # Tooltip to explain how comparison is computed
+                if text:
+                    lbl.setToolTip(
+                        "Compared to yesterday (full day). Based on precomputed daily aggregates; "
+                        "no on-the-fly calculation. Session-locked time is excluded."
+                    )
+                else:
+                    lbl.setToolTip("")
+            # Re-polish only when the class changes; polishing is costly. The last class is
+            # remembered on the label to avoid a property() round-trip into Qt.
+            klass = klass or ""
+            if getattr(lbl, "_dc_last_class", "") == klass:
+                return
+            lbl.setProperty("class", klass)
+            lbl._dc_last_class = klass  # type: ignore[attr-defined]
             # Re-polish to apply dynamic property changes
             try:
                 st = lbl.style()
@@ -307,6 +328,7 @@ class MainWindow(QMainWindow):
             return ""
 
     def _set_empty_state(self) -> None:
+        self._last_refresh_state = None
         try:
             self._date_lbl.setText("Today")
         except Exception:
@@ -330,10 +352,7 @@ class MainWindow(QMainWindow):
                 pass
 
     def _on_recalc_clicked(self) -> None:
-        try:
-            stand_thr = int(getattr(self._cfg_ns.app, "stand_threshold_mm", 900))
-        except Exception:
-            stand_thr = 900
+        stand_thr = self._stand_thr
         try:
             day_start_hour = int(getattr(self._cfg_ns.app, "start_of_day_hour", 4))
         except Exception:
@@ -361,39 +380,35 @@ class MainWindow(QMainWindow):
             dlg.setValue(0)
         except Exception:
             dlg = None
-        # Run in background thread
-        import threading
-        done_flag = {"done": False}
+        # Run on a pooled thread; `done` is delivered back on the GUI thread
+        signals = _RecalcSignals(self)
 
-        def _work():
+        def _on_done():
             try:
-                store.clear_daily_aggregates()
-                store.backfill_past_aggregates(stand_thr, start_of_day_hour=day_start_hour)
-                store.update_daily_aggregates_now(stand_thr, start_of_day_hour=day_start_hour)
+                if dlg is not None:
+                    dlg.close()
             except Exception:
                 pass
-            finally:
-                done_flag["done"] = True
-
-        threading.Thread(target=_work, daemon=True).start()
-
-        # Poll for completion
-        def _check_done():
-            if done_flag["done"]:
-                try:
-                    if dlg is not None:
-                        dlg.close()
-                except Exception:
-                    pass
-                self.refresh_stats()
-            else:
-                QTimer.singleShot(150, _check_done)
-
-        QTimer.singleShot(150, _check_done)
+            signals.deleteLater()
+            self._yday_cache = None
+            self.refresh_stats()
+
+        signals.done.connect(_on_done)
+        QThreadPool.globalInstance().start(_RecalcJob(stand_thr, day_start_hour, signals))
+
+    def _yesterday_totals(self, stand_thr: int, day_start_hour: int) -> tuple[int, int]:
+        stats_date = (datetime.now() - timedelta(hours=day_start_hour)).strftime("%Y-%m-%d")
+        key = (stats_date, stand_thr, day_start_hour)
+        cached = self._yday_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        totals = store.get_yesterday_full_aggregate(stand_thr, start_of_day_hour=day_start_hour)
+        self._yday_cache = (key, totals)
+        return totals
 
     def refresh_stats(self) -> None:
         try:
-            stand_thr = int(getattr(self._cfg_ns.app, "stand_threshold_mm", 900))
+            stand_thr = self._stand_thr
             day_start_hour = int(getattr(self._cfg_ns.app, "start_of_day_hour", 4))
             # One-time backfill of past days to avoid on-the-fly comparisons
             if not hasattr(self, "_backfill_done") or not self._backfill_done:
@@ -403,15 +418,37 @@ class MainWindow(QMainWindow):
                     pass
                 self._backfill_done = True
             today_sit, today_stand = store.get_today_aggregates(stand_thr, start_of_day_hour=day_start_hour)
-            y_sit, y_stand = store.get_yesterday_full_aggregate(stand_thr, start_of_day_hour=day_start_hour)
+            y_sit, y_stand = self._yesterday_totals(stand_thr, day_start_hour)
         except Exception:
             # If anything goes wrong, don't crash the UI
             self._set_empty_state()
             return
 
+        # Nothing to redraw unless the totals, settings or the hour changed (date and
+        # stats-window labels only depend on the local date and hour)
+        now_local = datetime.now()
+        state = (today_sit, today_stand, y_sit, y_stand, day_start_hour, self._goal_mm, now_local.strftime("%Y%m%d%H"))
+        if state == self._last_refresh_state:
+            return
+        self._last_refresh_state = state
+
+        # Coalesce the label/pill/card updates below into a single repaint
+        central = self.centralWidget() if hasattr(self, "centralWidget") else None
+        batching = central is not None and hasattr(central, "setUpdatesEnabled")
+        if batching:
+            central.setUpdatesEnabled(False)
+        try:
+            self._render_stats(now_local, day_start_hour, today_sit, today_stand, y_sit, y_stand)
+        finally:
+            if batching:
+                central.setUpdatesEnabled(True)
+                central.update()
+
+    def _render_stats(
+        self, now_local: datetime, day_start_hour: int, today_sit: int, today_stand: int, y_sit: int, y_stand: int
+    ) -> None:
         # Header: date and streak
         try:
-            now_local = datetime.now()
             self._date_lbl.setText(now_local.strftime("%a, %b %d"))
             window_text, window_tip = format_stats_window(now_local, day_start_hour)
             self._stats_window_lbl.setText(window_text)
@@ -440,21 +477,15 @@ class MainWindow(QMainWindow):
         # Summary pill (overall vs yesterday based on standing share)
         try:
             sum_text, sum_class = self._trend_label_pct(today_stand_pct, y_stand_pct)
-            if sum_text:
-                text = sum_text.replace("more than yesterday", "more than yesterday").replace("less than yesterday", "less than yesterday")
-            else:
-                text = ""
-            if text:
-                # Friendlier: "You're standing X% more/less than yesterday."
-                text = text.replace("% ", "% ")
-                text = text.replace("Same as yesterday", "Same as yesterday")
-            self._apply_pill(self._summary_pill, ("You're standing " + text) if text else "", sum_class)
+            # Friendlier: "You're standing X% more/less than yesterday."
+            text = ("You're standing " + sum_text) if sum_text else ""
+            self._apply_pill(self._summary_pill, text, sum_class)
         except Exception:
             pass
 
         # Standing card
         try:
-            self._stand_card.value_lbl.setText(self._fmt_hm(today_stand))
+            self._stand_card.value_lbl.setText(_fmt_hm(today_stand))
             # Remove trend pill inside cards per requirements
             self._stand_card.trend_lbl.setVisible(False)
             # Remove progress based on percentage inside card; keep card progress hidden
@@ -464,7 +495,7 @@ class MainWindow(QMainWindow):
 
         # Sitting card
         try:
-            self._sit_card.value_lbl.setText(self._fmt_hm(today_sit))
+            self._sit_card.value_lbl.setText(_fmt_hm(today_sit))
             self._sit_card.progress.setVisible(False)
             self._sit_card.trend_lbl.setVisible(False)
         except Exception:
@@ -472,7 +503,7 @@ class MainWindow(QMainWindow):
 
         # Goal progress bar (standing time vs goal)
         try:
-            goal_mm = self._goal_minutes()
+            goal_mm = self._goal_mm
             goal_sec = max(1, int(goal_mm) * 60)
             pct = int(min(100, (int(today_stand) * 100) // goal_sec))
             self._goal_prog.setVisible(True)
@@ -480,7 +511,7 @@ class MainWindow(QMainWindow):
             if today_stand >= goal_sec:
                 self._goal_prog.setFormat("Standing goal reached! 🎉")
             else:
-                self._goal_prog.setFormat(f"Standing goal: {self._fmt_hm(today_stand)} / {self._fmt_hm(goal_sec)} ({pct}%)")
+                self._goal_prog.setFormat(f"Standing goal: {_fmt_hm(today_stand)} / {_fmt_hm(goal_sec)} ({pct}%)")
         except Exception:
             pass
 
@@ -491,7 +522,18 @@ class MainWindow(QMainWindow):
             pass
 
     # Don’t quit the app when the main window is closed; just hide to tray
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        super().showEvent(event)
+        self.visibility_changed.emit(True)
+
+    def hideEvent(self, event) -> None:  # type: ignore[override]
+        super().hideEvent(event)
+        self.visibility_changed.emit(False)
+
     def closeEvent(self, event: QCloseEvent) -> None:  # type: ignore[override]
+        if not self.hide_on_close:
+            super().closeEvent(event)
+            return
         try:
             event.ignore()
         except Exception:
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
-from typing import Optional
+import functools
+import os
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Optional
 
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import (
     QDialog,
     QWidget,
@@ -15,14 +20,117 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
+try:
+    from ..config import AppConfig, get_user_config_path
+except Exception:  # pragma: no cover
+    from deskcoach.config import AppConfig, get_user_config_path  # type: ignore
+
 # Optional widgets for minimal test stubs
 try:  # pragma: no cover - exercised by import tests
-    from PyQt6.QtWidgets import QLabel as _QLabel, QGroupBox as _QGroupBox  # type: ignore
+    from PyQt6.QtWidgets import QLabel as _QLabel, QTabWidget as _QTabWidget  # type: ignore
     QLabel = _QLabel  # type: ignore
-    QGroupBox = _QGroupBox  # type: ignore
+    QTabWidget = _QTabWidget  # type: ignore
 except Exception:  # pragma: no cover
     QLabel = QWidget  # type: ignore
-    QGroupBox = QWidget  # type: ignore
+    QTabWidget = QWidget  # type: ignore
+
+
+def _help_label(text: str) -> QLabel:
+    """Static help text; broken into lines by hand, so Qt needs no word-wrap or rich-text pass."""
+    lbl = QLabel(text)
+    lbl.setTextFormat(Qt.TextFormat.PlainText)
+    return lbl
+
+
+def _new_form(page: QWidget) -> QFormLayout:
+    """Form layout for a settings page; rows never wrap, so Qt skips the wrap check per row."""
+    form = QFormLayout(page)
+    form.setRowWrapPolicy(QFormLayout.RowWrapPolicy.DontWrapRows)
+    return form
+
+
+def _cfg_spin(w: QSpinBox | QDoubleSpinBox, lo: float, hi: float, value: float, decimals: Optional[int] = None) -> None:
+    """Set a spin box's range, decimals and value with its signals blocked, so it emits no interim valueChanged."""
+    w.blockSignals(True)
+    try:
+        w.setRange(lo, hi)
+        if decimals is not None:
+            w.setDecimals(decimals)
+        w.setValue(value)
+    finally:
+        w.blockSignals(False)
+
+
+@functools.cache
+def _notifier():
+    """The notifier module, imported on first use to avoid a hard dependency during tests."""
+    try:
+        from ..services import notifier  # type: ignore
+    except Exception:
+        from deskcoach.services import notifier  # type: ignore
+    return notifier
+
+
+@functools.cache
+def _user_cfg_path() -> Path:
+    """config.get_user_config_path(), which load_config reads; fixed for the process lifetime."""
+    return get_user_config_path()
+
+
+# Spin box rows per settings section, in display order: (config key, widget class, range,
+# value type, label, tooltip). Defaults come from _DEFAULTS.
+_SPIN_ROWS = {
+    "connectivity": (
+        ("poll_minutes", QDoubleSpinBox, (0.01, 1440.0), float, "Poll interval (minutes)",
+         "How often to poll the service for new data."),
+        ("start_of_day_hour", QSpinBox, (0, 23), int, "Day starts at (hour)",
+         "Hour considered as the start of a day for statistics (0-23)."),
+    ),
+    "goals": (
+        ("stand_threshold_mm", QSpinBox, (300, 2000), int, "Stand threshold (mm)",
+         "Desk height above which you are considered standing (in millimeters)."),
+    ),
+    "reminders": (
+        ("remind_after_minutes", QSpinBox, (1, 600), int, "Remind after (minutes)",
+         "How long you can sit before the first stand reminder."),
+        ("remind_repeat_minutes", QSpinBox, (1, 600), int, "Repeat every (minutes)",
+         "How often to repeat the stand reminder until you stand or snooze."),
+        ("snooze_minutes", QSpinBox, (1, 600), int, "Snooze default (minutes)",
+         "Default snooze duration when you postpone a reminder."),
+    ),
+    "checks": (
+        ("standing_check_after_minutes", QSpinBox, (1, 600), int, "Standing check after (minutes)",
+         "Wait this long after the reminder before checking if you're standing."),
+        ("standing_check_repeat_minutes", QSpinBox, (1, 600), int, "Standing check repeat (minutes)",
+         "If still not standing, repeat the check with this interval."),
+        ("lock_reset_threshold_minutes", QSpinBox, (0, 1440), int, "Lock reset threshold (minutes)",
+         "If the computer was locked longer than this, the sit timer resets (minutes). Set 0 to disable."),
+    ),
+}
+
+# Config values shown by the dialog, with the defaults for keys the config object lacks
+_DEFAULTS: dict[str, Any] = {f.name: f.default for f in fields(AppConfig)}
+
+# Choices of the log level combo box, and each one's index in it
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+_LOG_LEVEL_INDEX = {name: i for i, name in enumerate(_LOG_LEVELS)}
+
+# Written by SettingsDialog._on_save; filled with str.format_map from _FIELDS
+_CFG_TEMPLATE = """[app]
+base_url = "{base_url}"
+poll_minutes = {poll_minutes}
+start_of_day_hour = {start_of_day_hour}
+stand_threshold_mm = {stand_threshold_mm}
+remind_after_minutes = {remind_after_minutes}
+remind_repeat_minutes = {remind_repeat_minutes}
+standing_check_after_minutes = {standing_check_after_minutes}
+standing_check_repeat_minutes = {standing_check_repeat_minutes}
+snooze_minutes = {snooze_minutes}
+lock_reset_threshold_minutes = {lock_reset_threshold_minutes}
+log_level = "{log_level}"
+stand_goal_mm = {stand_goal_mm}
+background_poll_factor = {background_poll_factor}
+"""
 
 
 class SettingsDialog(QDialog):
@@ -32,6 +140,38 @@ class SettingsDialog(QDialog):
     Expects a config namespace object with an `.app` attribute.
     """
 
+    # (key, tab title); each section is built by _build_<key>
+    _SECTIONS = (
+        ("connectivity", "Connectivity"),
+        ("goals", "Goals & thresholds"),
+        ("reminders", "Reminders"),
+        ("checks", "Standing checks"),
+        ("notifications", "Notifications"),
+        ("logging", "Logging"),
+    )
+
+    # (config key, reader) in file order; readers take the dialog
+    _FIELDS = (
+        ("base_url", lambda self: self.base_url.text()),
+        ("poll_minutes", lambda self: float(self.poll_minutes.value())),
+        ("start_of_day_hour", lambda self: int(self.start_of_day_hour.value())),
+        ("stand_threshold_mm", lambda self: int(self.stand_threshold_mm.value())),
+        ("remind_after_minutes", lambda self: int(self.remind_after_minutes.value())),
+        ("remind_repeat_minutes", lambda self: int(self.remind_repeat_minutes.value())),
+        ("standing_check_after_minutes", lambda self: int(self.standing_check_after_minutes.value())),
+        ("standing_check_repeat_minutes", lambda self: int(self.standing_check_repeat_minutes.value())),
+        ("snooze_minutes", lambda self: int(self.snooze_minutes.value())),
+        ("lock_reset_threshold_minutes", lambda self: int(self.lock_reset_threshold_minutes.value())),
+        # When QComboBox fallback is used (tests), currentText may be missing
+        ("log_level", lambda self: str(getattr(self.log_level, 'currentText', lambda: 'INFO')()).upper()),
+        ("stand_goal_mm", lambda self: int(round(self.stand_goal_hours.value() * 60))),
+        # Not exposed in the dialog; carry the file's value over
+        ("background_poll_factor", lambda self: int(getattr(self._cfg_ns.app, 'background_poll_factor', 1))),
+    )
+
+    # QSystemTrayIcon.supportsMessages(), once the Notifications section probed it
+    _supports_tray_msgs: Optional[bool] = None
+
     def __init__(self, parent: Optional[QWidget], cfg_ns) -> None:
         super().__init__(parent)
         self.setWindowTitle("DeskCoach Settings")
@@ -39,246 +179,176 @@ class SettingsDialog(QDialog):
         self.setMinimumWidth(640)
         self.resize(720, 640)
 
-        self._cfg_ns = cfg_ns  # SimpleNamespace with .app
-        appcfg = cfg_ns.app
+        self._cfg_ns = cfg_ns  # config.Config with .app
 
         main = QVBoxLayout(self)
 
-        # Connectivity section
-        conn_box = QGroupBox("Connectivity")
-        conn_form = QFormLayout(conn_box)
-        conn_help = QLabel("Where DeskCoach connects to fetch desk posture/height data. Use the full base URL of your watcher service.")
-        conn_help.setWordWrap(True)
+        # One tab per section; a section's widgets are only built when its tab is first shown
+        self._tabs = QTabWidget(self)
+        self._pages: dict[str, QWidget] = {}
+        self._built: set[str] = set()
+        self._cfg_values: dict[str, Any] | None = None
+        for key, title in self._SECTIONS:
+            page = QWidget()
+            self._pages[key] = page
+            self._tabs.addTab(page, title)
+        self._tabs.currentChanged.connect(self._on_tab_changed)
+        main.addWidget(self._tabs)
+        self._ensure_built(self._SECTIONS[0][0])
+
+        # Buttons row
+        btn_row = QHBoxLayout()
+        btn_save = QPushButton("Save")
+        btn_cancel = QPushButton("Cancel")
+        btn_save.clicked.connect(self._on_save)
+        btn_cancel.clicked.connect(self.reject)
+        btn_row.addWidget(btn_save)
+        btn_row.addWidget(btn_cancel)
+        main.addLayout(btn_row)
+
+    def _on_tab_changed(self, index: int) -> None:
+        if 0 <= index < len(self._SECTIONS):
+            self._ensure_built(self._SECTIONS[index][0])
+
+    def _ensure_built(self, key: str) -> None:
+        if key in self._built:
+            return
+        self._built.add(key)
+        if self._cfg_values is None:
+            # One snapshot of the config serves every section
+            appcfg = self._cfg_ns.app
+            self._cfg_values = {name: getattr(appcfg, name, default) for name, default in _DEFAULTS.items()}
+        page = self._pages[key]
+        # Populate with updates off so the rows are laid out once, not per addRow
+        page.setUpdatesEnabled(False)
+        try:
+            getattr(self, f"_build_{key}")(page, self._cfg_values)
+        finally:
+            page.setUpdatesEnabled(True)
+
+    def _add_spin_rows(self, form: QFormLayout, cfg: dict[str, Any], section: str) -> None:
+        """Add the _SPIN_ROWS of section to form, each stored as self.<key>."""
+        for key, cls, (lo, hi), value_type, label, tip in _SPIN_ROWS[section]:
+            w = cls()
+            _cfg_spin(w, lo, hi, value_type(cfg[key]))
+            w.setToolTip(tip)
+            setattr(self, key, w)
+            form.addRow(label, w)
+
+    def _build_connectivity(self, page: QWidget, cfg: dict[str, Any]) -> None:
+        conn_form = _new_form(page)
+        conn_help = _help_label("Where DeskCoach connects to fetch desk posture/height data.\nUse the full base URL of your watcher service.")
         conn_form.addRow(conn_help)
 
-        self.base_url = QLineEdit(str(getattr(appcfg, "base_url", "")))
+        self.base_url = QLineEdit(str(cfg["base_url"]))
         self.base_url.setPlaceholderText("https://example.your-watcher.local")
         self.base_url.setToolTip("Base address of the desk watcher service that provides current height and history.")
-        self.poll_minutes = QDoubleSpinBox()
-        self.poll_minutes.setRange(0.01, 1440.0)
-        self.poll_minutes.setDecimals(2)
-        self.poll_minutes.setValue(float(getattr(appcfg, "poll_minutes", 5)))
-        self.poll_minutes.setToolTip("How often to poll the service for new data.")
-        self.start_of_day_hour = QSpinBox()
-        self.start_of_day_hour.setRange(0, 23)
-        self.start_of_day_hour.setValue(int(getattr(appcfg, "start_of_day_hour", 4)))
-        self.start_of_day_hour.setToolTip("Hour considered as the start of a day for statistics (0-23).")
         conn_form.addRow("Base URL", self.base_url)
-        conn_form.addRow("Poll interval (minutes)", self.poll_minutes)
-        conn_form.addRow("Day starts at (hour)", self.start_of_day_hour)
-        main.addWidget(conn_box)
-
-        # Goals & thresholds
-        goal_box = QGroupBox("Goals & thresholds")
-        goal_form = QFormLayout(goal_box)
-        goal_help = QLabel("Configure when DeskCoach considers you standing and your daily standing goal.")
-        goal_help.setWordWrap(True)
+        self._add_spin_rows(conn_form, cfg, "connectivity")
+
+    def _build_goals(self, page: QWidget, cfg: dict[str, Any]) -> None:
+        goal_form = _new_form(page)
+        goal_help = _help_label("Configure when DeskCoach considers you standing and your daily standing goal.")
         goal_form.addRow(goal_help)
 
-        self.stand_threshold_mm = QSpinBox()
-        self.stand_threshold_mm.setRange(300, 2000)
-        self.stand_threshold_mm.setValue(int(getattr(appcfg, "stand_threshold_mm", 900)))
-        self.stand_threshold_mm.setToolTip("Desk height above which you are considered standing (in millimeters).")
+        self._add_spin_rows(goal_form, cfg, "goals")
 
         # Daily standing goal (hours)
         self.stand_goal_hours = QDoubleSpinBox()
-        self.stand_goal_hours.setRange(0.0, 24.0)
-        self.stand_goal_hours.setDecimals(1)
         try:
-            goal_mm = int(getattr(appcfg, "stand_goal_mm", 240))
+            goal_mm = int(cfg["stand_goal_mm"])
         except Exception:
             goal_mm = 240
-        self.stand_goal_hours.setValue(max(0.0, float(goal_mm) / 60.0))
+        _cfg_spin(self.stand_goal_hours, 0.0, 24.0, max(0.0, float(goal_mm) / 60.0), decimals=1)
         self.stand_goal_hours.setToolTip("Target amount of time to spend standing each day (hours).")
 
-        goal_form.addRow("Stand threshold (mm)", self.stand_threshold_mm)
         goal_form.addRow("Daily standing goal (hours)", self.stand_goal_hours)
-        main.addWidget(goal_box)
 
-        # Reminders section
-        rem_box = QGroupBox("Reminders")
-        rem_form = QFormLayout(rem_box)
-        rem_help = QLabel("DeskCoach will remind you to stand after you've been sitting for a while. Configure the timing here.")
-        rem_help.setWordWrap(True)
+    def _build_reminders(self, page: QWidget, cfg: dict[str, Any]) -> None:
+        rem_form = _new_form(page)
+        rem_help = _help_label("DeskCoach will remind you to stand after you've been sitting for a while.\nConfigure the timing here.")
         rem_form.addRow(rem_help)
 
-        self.remind_after_minutes = QSpinBox()
-        self.remind_after_minutes.setRange(1, 600)
-        self.remind_after_minutes.setValue(int(getattr(appcfg, "remind_after_minutes", 45)))
-        self.remind_after_minutes.setToolTip("How long you can sit before the first stand reminder.")
-
-        self.remind_repeat_minutes = QSpinBox()
-        self.remind_repeat_minutes.setRange(1, 600)
-        self.remind_repeat_minutes.setValue(int(getattr(appcfg, "remind_repeat_minutes", 5)))
-        self.remind_repeat_minutes.setToolTip("How often to repeat the stand reminder until you stand or snooze.")
-
-        self.snooze_minutes = QSpinBox()
-        self.snooze_minutes.setRange(1, 600)
-        self.snooze_minutes.setValue(int(getattr(appcfg, "snooze_minutes", 30)))
-        self.snooze_minutes.setToolTip("Default snooze duration when you postpone a reminder.")
-
-        rem_form.addRow("Remind after (minutes)", self.remind_after_minutes)
-        rem_form.addRow("Repeat every (minutes)", self.remind_repeat_minutes)
-        rem_form.addRow("Snooze default (minutes)", self.snooze_minutes)
-        main.addWidget(rem_box)
-
-        # Standing checks section
-        chk_box = QGroupBox("Standing checks")
-        chk_form = QFormLayout(chk_box)
-        chk_help = QLabel("After a reminder, DeskCoach checks if you're standing. These intervals control that verification.")
-        chk_help.setWordWrap(True)
+        self._add_spin_rows(rem_form, cfg, "reminders")
+
+    def _build_checks(self, page: QWidget, cfg: dict[str, Any]) -> None:
+        chk_form = _new_form(page)
+        chk_help = _help_label("After a reminder, DeskCoach checks if you're standing.\nThese intervals control that verification.")
         chk_form.addRow(chk_help)
 
-        self.standing_check_after_minutes = QSpinBox()
-        self.standing_check_after_minutes.setRange(1, 600)
-        self.standing_check_after_minutes.setValue(int(getattr(appcfg, "standing_check_after_minutes", 30)))
-        self.standing_check_after_minutes.setToolTip("Wait this long after the reminder before checking if you're standing.")
-
-        self.standing_check_repeat_minutes = QSpinBox()
-        self.standing_check_repeat_minutes.setRange(1, 600)
-        self.standing_check_repeat_minutes.setValue(int(getattr(appcfg, "standing_check_repeat_minutes", 30)))
-        self.standing_check_repeat_minutes.setToolTip("If still not standing, repeat the check with this interval.")
-
-        self.lock_reset_threshold_minutes = QSpinBox()
-        self.lock_reset_threshold_minutes.setRange(0, 1440)
-        self.lock_reset_threshold_minutes.setValue(int(getattr(appcfg, "lock_reset_threshold_minutes", 5)))
-        self.lock_reset_threshold_minutes.setToolTip("If the computer was locked longer than this, the sit timer resets (minutes). Set 0 to disable.")
-
-        chk_form.addRow("Standing check after (minutes)", self.standing_check_after_minutes)
-        chk_form.addRow("Standing check repeat (minutes)", self.standing_check_repeat_minutes)
-        chk_form.addRow("Lock reset threshold (minutes)", self.lock_reset_threshold_minutes)
-        main.addWidget(chk_box)
-
-        # Notifications section
-        notif_box = QGroupBox("Notifications")
-        notif_form = QFormLayout(notif_box)
-        notif_help = QLabel("DeskCoach uses the system tray to show notifications. On Windows, they appear as native notifications.")
-        notif_help.setWordWrap(True)
+        self._add_spin_rows(chk_form, cfg, "checks")
+
+    def _build_notifications(self, page: QWidget, cfg: dict[str, Any]) -> None:
+        notif_form = _new_form(page)
+        notif_help = _help_label("DeskCoach uses the system tray to show notifications.\nOn Windows, they appear as native notifications.")
         notif_form.addRow(notif_help)
 
-        # Test notification button to preview current settings and check system support
-        try:
-            from PyQt6.QtWidgets import QPushButton as _QPushButton, QSystemTrayIcon as _QSystemTrayIcon  # type: ignore
-            test_btn = _QPushButton("Test notification")
-            def _do_test():
-                try:
-                    # Check whether the platform supports tray messages
-                    supports = False
-                    try:
-                        supports = bool(_QSystemTrayIcon.supportsMessages())
-                    except Exception:
-                        supports = False
+        # Test notification button to preview current settings; pointless without tray messages
+        if self._tray_supports_messages():
+            test_btn = QPushButton("Test notification")
+            test_btn.clicked.connect(self._on_test_clicked)
+            notif_form.addRow(test_btn)
+        else:
+            notif_form.addRow(QLabel("Notifications are not supported on this system."))
 
-                    # Provide user feedback
-                    if supports:
-                        QMessageBox.information(self, "Notifications supported", "Your system supports tray notifications. A test notification will be sent now.")
-                    else:
-                        QMessageBox.warning(self, "Notifications not supported", "Your system does not report support for tray notifications. DeskCoach may not be able to show reminder popups on this system. We'll still try using a fallback.")
+    @classmethod
+    def _tray_supports_messages(cls) -> bool:
+        """QSystemTrayIcon.supportsMessages(), probed once per run."""
+        if cls._supports_tray_msgs is None:
+            try:
+                from PyQt6.QtWidgets import QSystemTrayIcon  # type: ignore
+                cls._supports_tray_msgs = bool(QSystemTrayIcon.supportsMessages())
+            except Exception:
+                cls._supports_tray_msgs = False
+        return cls._supports_tray_msgs
 
-                    # Lazy import to avoid hard dependency during tests
-                    try:
-                        from ..services import notifier as _notifier  # type: ignore
-                    except Exception:
-                        from deskcoach.services import notifier as _notifier  # type: ignore
-                    _notifier.notify("DeskCoach test", "This is a test notification.")
-                except Exception:
-                    # Silent fail; we don't want the settings dialog to crash on test
-                    pass
-            test_btn.clicked.connect(_do_test)
-            notif_form.addRow(test_btn)
+    def _on_test_clicked(self) -> None:
+        try:
+            QMessageBox.information(self, "Notifications supported", "Your system supports tray notifications. A test notification will be sent now.")
+            _notifier().notify("DeskCoach test", "This is a test notification.")
         except Exception:
+            # Silent fail; we don't want the settings dialog to crash on test
             pass
 
-        main.addWidget(notif_box)
-
-        # Logging section (separate from notifications)
-        log_box = QGroupBox("Logging")
-        log_form = QFormLayout(log_box)
-        log_help = QLabel("Configure application logging verbosity. This does not affect notifications.")
-        log_help.setWordWrap(True)
+    def _build_logging(self, page: QWidget, cfg: dict[str, Any]) -> None:
+        log_form = _new_form(page)
+        log_help = _help_label("Configure application logging verbosity.\nThis does not affect notifications.")
         log_form.addRow(log_help)
 
         # Log level selector (lazy import to allow tests without full PyQt6 widgets)
         try:
             from PyQt6.QtWidgets import QComboBox  # type: ignore
             self.log_level = QComboBox()
-            self.log_level.addItems(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
-            current_level = str(getattr(appcfg, "log_level", "INFO")).upper()
-            idx = max(0, self.log_level.findText(current_level))
-            self.log_level.setCurrentIndex(idx)
+            self.log_level.addItems(_LOG_LEVELS)
+            current_level = str(cfg["log_level"]).upper()
+            self.log_level.setCurrentIndex(_LOG_LEVEL_INDEX.get(current_level, _LOG_LEVEL_INDEX["INFO"]))
         except Exception:
             # Fallback placeholder when QComboBox is unavailable in minimal test stubs
             self.log_level = QWidget(self)
 
         log_form.addRow("Log level", self.log_level)
-        main.addWidget(log_box)
-
-        # Buttons row
-        btn_row = QHBoxLayout()
-        btn_save = QPushButton("Save")
-        btn_cancel = QPushButton("Cancel")
-        btn_save.clicked.connect(self._on_save)
-        btn_cancel.clicked.connect(self.reject)
-        btn_row.addWidget(btn_save)
-        btn_row.addWidget(btn_cancel)
-        main.addLayout(btn_row)
 
     def _on_save(self) -> None:
         try:
-            # Persist to the user data config path used by config.load_config
-            from ..config import get_user_config_path
-
-            # Collect values
-            base_url = self.base_url.text()
-            poll_minutes = float(self.poll_minutes.value())
-            start_of_day_hour = int(self.start_of_day_hour.value())
-            stand_threshold_mm = int(self.stand_threshold_mm.value())
-            remind_after_minutes = int(self.remind_after_minutes.value())
-            remind_repeat_minutes = int(self.remind_repeat_minutes.value())
-            standing_check_after_minutes = int(self.standing_check_after_minutes.value())
-            standing_check_repeat_minutes = int(self.standing_check_repeat_minutes.value())
-            snooze_minutes = int(self.snooze_minutes.value())
-            lock_reset_threshold_minutes = int(self.lock_reset_threshold_minutes.value())
-            # When QComboBox fallback is used (tests), currentText may be missing
-            log_level = str(getattr(self.log_level, 'currentText', lambda: 'INFO')()).upper()
-            stand_goal_mm = int(round(self.stand_goal_hours.value() * 60))
-
-            cfg_text = (
-                "[app]\n"
-                f"base_url = \"{base_url}\"\n"
-                f"poll_minutes = {poll_minutes}\n"
-                f"start_of_day_hour = {start_of_day_hour}\n"
-                f"stand_threshold_mm = {stand_threshold_mm}\n"
-                f"remind_after_minutes = {remind_after_minutes}\n"
-                f"remind_repeat_minutes = {remind_repeat_minutes}\n"
-                f"standing_check_after_minutes = {standing_check_after_minutes}\n"
-                f"standing_check_repeat_minutes = {standing_check_repeat_minutes}\n"
-                f"snooze_minutes = {snooze_minutes}\n"
-                f"lock_reset_threshold_minutes = {lock_reset_threshold_minutes}\n"
-                f"log_level = \"{log_level}\"\n"
-                f"stand_goal_mm = {stand_goal_mm}\n"
-            )
-
-            cfg_path = get_user_config_path()
-            cfg_path.write_text(cfg_text, encoding="utf-8")
+            # Values are read from every section, so build the ones never shown
+            for key, _title in self._SECTIONS:
+                self._ensure_built(key)
+            values = {key: getter(self) for key, getter in self._FIELDS}
+            start_of_day_hour = values["start_of_day_hour"]
+
+            # Write a sibling temp file and swap it in, so a crash never leaves a torn config
+            cfg_path = _user_cfg_path()
+            tmp_path = cfg_path.with_suffix(".toml.tmp")
+            tmp_path.write_text(_CFG_TEMPLATE.format_map(values), encoding="utf-8")
+            os.replace(tmp_path, cfg_path)
 
             # Update in-memory config namespace so the rest of the app reflects changes immediately
             try:
                 appcfg = getattr(self._cfg_ns, 'app', None)
                 prev_start_of_day = int(getattr(appcfg, 'start_of_day_hour', 4)) if appcfg is not None else 4
                 if appcfg is not None:
-                    appcfg.base_url = base_url
-                    appcfg.poll_minutes = poll_minutes
-                    appcfg.start_of_day_hour = start_of_day_hour
-                    appcfg.stand_threshold_mm = stand_threshold_mm
-                    appcfg.remind_after_minutes = remind_after_minutes
-                    appcfg.remind_repeat_minutes = remind_repeat_minutes
-                    appcfg.standing_check_after_minutes = standing_check_after_minutes
-                    appcfg.standing_check_repeat_minutes = standing_check_repeat_minutes
-                    appcfg.snooze_minutes = snooze_minutes
-                    appcfg.lock_reset_threshold_minutes = lock_reset_threshold_minutes
-                    appcfg.log_level = log_level
-                    appcfg.stand_goal_mm = stand_goal_mm
+                    for key, value in values.items():
+                        setattr(appcfg, key, value)
                 if prev_start_of_day != start_of_day_hour:
                     try:
                         from ..models import store
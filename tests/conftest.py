@@ -1,12 +1,49 @@
 import os
+import shutil
 import sys
+import types
 from pathlib import Path
 
-def pytest_sessionstart(session):
-    # Ensure headless Qt where applicable
+import pytest
+
+# Resolved once per session
+_SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+
+def pytest_configure(config):
+    # Runs before collection imports any test module: ensure headless, quiet Qt
     os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ.setdefault("QT_LOGGING_RULES", "*.debug=false")
     # Ensure src is on sys.path without needing plugins
-    root = Path(__file__).resolve().parents[1]
-    src = root / "src"
-    if str(src) not in sys.path:
-        sys.path.insert(0, str(src))
+    if _SRC not in sys.path:
+        sys.path.insert(0, _SRC)
+    # Minimal PyQt6.QtCore (QObject only) so services import without Qt; test
+    # modules needing more install their own fakes
+    qtcore = types.SimpleNamespace(QObject=object)
+    sys.modules.setdefault("PyQt6", types.SimpleNamespace(QtCore=qtcore))
+    sys.modules.setdefault("PyQt6.QtCore", qtcore)
+
+
+@pytest.fixture(scope="session")
+def _schema_db(tmp_path_factory):
+    """A database file with the current schema, built once per session for store_db to copy."""
+    from deskcoach.models import store
+
+    template = tmp_path_factory.mktemp("schema") / "deskcoach.db"
+    conn = store.connect(template)
+    try:
+        conn.executescript(store._SCHEMA_SQL)
+    finally:
+        conn.close()  # the last close checkpoints the WAL into the file
+    return template
+
+
+@pytest.fixture
+def store_db(tmp_path, monkeypatch, _schema_db):
+    """deskcoach.models.store pointed at a fresh, initialized database under tmp_path."""
+    from deskcoach.models import store
+
+    dbfile = tmp_path / "deskcoach.db"
+    shutil.copyfile(_schema_db, dbfile)
+    monkeypatch.setattr(store, "db_path", lambda: dbfile)
+    return store
@@ -1,25 +1,31 @@
+import functools
 import types
+from dataclasses import dataclass, field
+
+import httpx
 import pytest
 
 import deskcoach.services.api_client as api
 
 
+@dataclass(slots=True)
 class DummyResponse:
-    def __init__(self, status_code=200, json_data=None, raise_for_status_exc=None):
-        self.status_code = status_code
-        self._json = json_data or {}
-        self._exc = raise_for_status_exc
+    status_code: int = 200
+    json_data: dict = field(default_factory=dict)
+    raise_for_status_exc: Exception | None = None
 
     def raise_for_status(self):
-        if self._exc:
-            raise self._exc
+        if self.raise_for_status_exc:
+            raise self.raise_for_status_exc
 
     def json(self):
-        return self._json
+        return self.json_data
 
 
 class DummyClient:
-    def __init__(self, responses):
+    __slots__ = ("_responses", "calls")
+
+    def __init__(self, responses, timeout=None, transport=None):
         self._responses = responses
         self.calls = 0
 
@@ -29,7 +35,7 @@ class DummyClient:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def get(self, url):
+    def get(self, url, timeout=None):
         idx = min(self.calls, len(self._responses) - 1)
         self.calls += 1
         return self._responses[idx]
@@ -38,7 +44,15 @@ class DummyClient:
 class DummyHTTPX:
     def __init__(self, responses):
         self._responses = responses
-        self.Client = lambda timeout=None: DummyClient(self._responses)
+        self.Client = functools.partial(DummyClient, responses)
+        self.HTTPTransport = lambda **kwargs: kwargs
+        self.Limits = lambda **kwargs: kwargs
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch):
+    # Shared clients are cached per base URL; start every test without them
+    monkeypatch.setattr(api, "_CLIENTS", {})
 
 
 def test_get_height_mm_success(monkeypatch):
@@ -56,3 +70,72 @@ def test_get_height_mm_missing_key_raises(monkeypatch):
     monkeypatch.setattr(api, "httpx", dummy)
     with pytest.raises(RuntimeError):
         api.get_height_mm("http://host", retries=1)
+
+
+def test_get_height_mm_reuses_client(monkeypatch):
+    dummy = DummyHTTPX([DummyResponse(json_data={"table_height": 80})])
+    created = []
+
+    def make_client(**kwargs):
+        created.append(DummyClient(dummy._responses))
+        return created[-1]
+
+    dummy.Client = make_client
+    monkeypatch.setattr(api, "httpx", dummy)
+    assert api.get_height_mm("http://host") == 800
+    assert api.get_height_mm("http://host") == 800
+    assert len(created) == 1 and created[0].calls == 2
+
+
+def _status_error(code):
+    return httpx.HTTPStatusError("status", request=None, response=types.SimpleNamespace(status_code=code))
+
+
+def test_get_height_mm_retries_server_errors_with_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(api.time, "sleep", sleeps.append)
+    responses = [
+        DummyResponse(raise_for_status_exc=_status_error(503)),
+        DummyResponse(json_data={"table_height": 75}),
+    ]
+    monkeypatch.setattr(api, "httpx", DummyHTTPX(responses))
+    assert api.get_height_mm("http://host", retries=2) == 750
+    assert len(sleeps) == 1 and 0 <= sleeps[0] <= api._BACKOFF_BASE_SEC
+
+
+def test_get_height_mm_does_not_retry_client_errors(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(api.time, "sleep", sleeps.append)
+    dummy = DummyHTTPX([DummyResponse(raise_for_status_exc=_status_error(404))])
+    monkeypatch.setattr(api, "httpx", dummy)
+    with pytest.raises(RuntimeError):
+        api.get_height_mm("http://host", retries=2)
+    assert sleeps == []
+
+
+def test_get_height_mm_leaves_connect_errors_to_transport(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(api.time, "sleep", sleeps.append)
+
+    class RefusingClient(DummyClient):
+        def get(self, url, timeout=None):
+            self.calls += 1
+            raise httpx.ConnectError("refused")
+
+    dummy = DummyHTTPX([])
+    client = RefusingClient([])
+    dummy.Client = lambda **kwargs: client
+    monkeypatch.setattr(api, "httpx", dummy)
+    with pytest.raises(RuntimeError):
+        api.get_height_mm("http://host", retries=2)
+    assert client.calls == 1 and sleeps == []
+
+
+def test_cm_to_mm_handles_ints_floats_and_strings():
+    assert api._cm_to_mm(79) == 790
+    assert api._cm_to_mm(79.46) == 795
+    assert api._cm_to_mm("80") == 800
+    assert api._cm_to_mm(" 80.2 ") == 802
+    with pytest.raises(ValueError):
+        api._cm_to_mm("tall")
+
@@ -98,3 +98,50 @@ def test_load_config_uses_existing_in_data_dir(tmp_path: Path, monkeypatch: pyte
     assert ns.base_url == "http://from-data-dir"
     assert ns.poll_minutes == 3.5
     assert ns.snooze_minutes == 15
+
+
+def test_load_config_reuses_cache_until_file_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cfg_path = write_tmp_config(
+        tmp_path,
+        """
+        [app]
+        snooze_minutes = 20
+        """,
+    )
+    calls = []
+    real_load = cfgmod._load_from_path
+
+    def counting_load(p):
+        calls.append(p)
+        return real_load(p)
+
+    monkeypatch.setattr(cfgmod, "_load_from_path", counting_load)
+
+    first = load_config(cfg_path)
+    first.app.snooze_minutes = 99  # callers may mutate their copy
+    second = load_config(cfg_path)
+    assert len(calls) == 1
+    assert second.app.snooze_minutes == 20
+
+    cfg_path.write_text("[app]\nsnooze_minutes = 25\n", encoding="utf-8")
+    third = load_config(cfg_path)
+    assert len(calls) == 2
+    assert third.app.snooze_minutes == 25
+
+
+def test_load_config_falls_back_to_embedded_defaults(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    class DummyPlatformDirs:
+        def __init__(self, appname: str, appauthor: str, roaming: bool = False):
+            self.user_data_dir = str(tmp_path / "data")
+
+    def failing_write(path):
+        raise PermissionError("read-only data dir")
+
+    monkeypatch.setattr(cfgmod, "PlatformDirs", DummyPlatformDirs)
+    monkeypatch.setattr(cfgmod, "_candidate_config_paths", lambda: ())
+    monkeypatch.setattr(cfgmod, "_write_default_to", failing_write)
+
+    ns = load_config().app
+    assert ns.snooze_minutes == 30
+    assert ns.log_level == "WARNING"
+    assert cfgmod._DEFAULT_CONFIG_PARSED["app"]["snooze_minutes"] == 30
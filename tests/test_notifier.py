@@ -7,10 +7,31 @@ import deskcoach.services.notifier as notifier
 def test_notifier_falls_back_to_stderr(monkeypatch, capsys):
     monkeypatch.setenv("PYTHONIOENCODING", "utf-8")
 
-    # Ensure no tray is present in the notifier module
-    if "tray" in notifier.__dict__:
-        del notifier.__dict__["tray"]
+    # Ensure no tray is registered with the notifier module
+    notifier.set_tray(None)
 
     notifier.notify("Title", "Message")
     out = capsys.readouterr()
     assert "[Notification] Title: Message" in out.err
+
+
+def test_set_tray_switches_delivery(monkeypatch, capsys):
+    class FakeTray:
+        def __init__(self):
+            self.messages = []
+
+        def showMessage(self, title, message):
+            self.messages.append((title, message))
+
+    monkeypatch.setattr(notifier, "QSystemTrayIcon", FakeTray)
+    tray = FakeTray()
+    notifier.set_tray(None)
+    notifier.notify("Before", "stderr")
+    notifier.set_tray(tray)
+    notifier.notify("Title", "Message")
+    notifier.set_tray(None)
+    notifier.notify("After", "stderr")
+
+    assert tray.messages == [("Title", "Message")]
+    err = capsys.readouterr().err
+    assert "[Notification] Before: stderr" in err and "[Notification] After: stderr" in err
@@ -1,16 +1,25 @@
+from dataclasses import replace
 from types import SimpleNamespace
-from datetime import datetime, timedelta
-import sys
-import types
+from datetime import datetime
 
-# Install a minimal dummy PyQt6.QtCore with QObject to satisfy reminder import
-qtcore = types.SimpleNamespace(QObject=object)
-pyqt6 = types.SimpleNamespace(QtCore=qtcore)
-sys.modules.setdefault("PyQt6", pyqt6)
-sys.modules.setdefault("PyQt6.QtCore", qtcore)
+import pytest
 
 import deskcoach.services.reminder as reminder
 
+# Fixed reference time for every sample, so results never depend on the wall clock
+BASE_TS = int(datetime(2025, 1, 1, 12, 0, 0).timestamp())
+
+# Engine settings for engine_factory; tests override fields with dataclasses.replace
+_DEFAULT_CFG = reminder.ReminderConfig(
+    stand_threshold_mm=900,
+    remind_after_minutes=1,
+    remind_repeat_minutes=5,
+    snooze_minutes=30,
+    standing_check_after_minutes=30,
+    standing_check_repeat_minutes=30,
+    lock_reset_threshold_minutes=5,
+)
+
 
 class DummySession:
     def __init__(self, unlocked=True):
@@ -20,91 +29,221 @@ class DummySession:
         return self._unlocked
 
 
-def make_engine(monkeypatch, **cfg_kwargs):
-    cfg = SimpleNamespace(
-        stand_threshold_mm=900,
-        remind_after_minutes=1,
-        remind_repeat_minutes=5,
-        snooze_minutes=30,
-        standing_check_after_minutes=30,
-        standing_check_repeat_minutes=30,
-    )
-    for k, v in cfg_kwargs.items():
-        setattr(cfg, k, v)
+class FrozenClock:
+    """Stands in for time.monotonic(); only moves when tick() is called."""
 
-    sess = DummySession(unlocked=True)
+    def __init__(self, start=1000.0):
+        self.now = start
 
-    eng = reminder.ReminderEngine(cfg, sess)
-    # Avoid DB access by patching streak calculators
-    monkeypatch.setattr(eng, "_compute_seated_streak_minutes", lambda ts, h: 60)
-    monkeypatch.setattr(eng, "_compute_standing_streak_minutes", lambda ts, h: 0)
-    # Patch notifier to capture calls
+    def __call__(self):
+        return self.now
+
+    def tick(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # The engine reads only time.monotonic(); freeze it for the reminder module alone
+    clk = FrozenClock()
+    monkeypatch.setattr(reminder, "time", SimpleNamespace(monotonic=clk))
+    return clk
+
+
+@pytest.fixture
+def engine_factory():
+    """Return make(**overrides) -> (engine, notify calls), with streaks and notifier stubbed."""
+    # Notifications are captured here; one list per test
     calls = []
 
-    def fake_notify(title, message):
-        calls.append((title, message))
+    def make(*, seated_streak_fn=lambda ts, h: 60, standing_streak_fn=lambda ts, h: 0, **cfg_kwargs):
+        cfg = replace(_DEFAULT_CFG, **cfg_kwargs)
+        # Fixed streaks instead of DB lookups
+        eng = reminder.ReminderEngine(
+            cfg,
+            DummySession(unlocked=True),
+            seated_streak_fn=seated_streak_fn,
+            standing_streak_fn=standing_streak_fn,
+            notify=lambda title, message: calls.append((title, message)),
+        )
+        return eng, calls
+
+    return make
+
+
+@pytest.fixture
+def engine(engine_factory):
+    return engine_factory()
 
-    monkeypatch.setattr(reminder.notifier, "notify", fake_notify)
-    return eng, calls
 
+@pytest.mark.parametrize("precondition,expected_calls", [("none", 1), ("snooze", 0), ("locked", 0)])
+def test_seated_sample_notifies_unless_snoozed_or_locked(engine, precondition, expected_calls):
+    eng, calls = engine
+    if precondition == "snooze":
+        eng.snooze(10)
+    elif precondition == "locked":
+        # Simulate locked by swapping session method
+        eng._session.is_unlocked = lambda: False
+    eng.on_new_measurement(BASE_TS, 800)  # seated
+    assert len(calls) == expected_calls
 
-def test_snooze_suppresses_notifications(monkeypatch):
-    eng, calls = make_engine(monkeypatch, remind_after_minutes=1, remind_repeat_minutes=1)
+
+def test_snooze_expiry_resumes_notifications(engine_factory, clock):
+    eng, calls = engine_factory(remind_after_minutes=1, remind_repeat_minutes=1)
     eng.snooze(10)
-    eng.on_new_measurement(int(datetime.now().timestamp()), 800)  # seated
+    ts = BASE_TS
+    eng.on_new_measurement(ts, 800)  # seated
     assert calls == []
+    # Once the snooze has run out, the seated reminder fires
+    clock.tick(10 * 60 + 1)
+    eng.on_new_measurement(ts + 20, 800)
+    assert calls and calls[0][0] == "Stand up"
 
 
-def test_seated_triggers_once_then_cadence(monkeypatch):
-    eng, calls = make_engine(monkeypatch, remind_after_minutes=1, remind_repeat_minutes=10)
-    ts = int(datetime.now().timestamp())
+def test_seated_triggers_once_then_cadence(engine_factory, clock):
+    eng, calls = engine_factory(remind_after_minutes=1, remind_repeat_minutes=10)
+    ts = BASE_TS
     eng.on_new_measurement(ts, 800)  # seated below threshold
     assert calls and calls[0][0] == "Stand up"
     # Immediate second call should not notify due to repeat cadence
     eng.on_new_measurement(ts + 5, 800)
     assert len(calls) == 1
-    # Manually allow next notification by moving next_ready into the past
-    eng._next_ready_seated = datetime.now() - timedelta(seconds=1)
+    # Step past the repeat cadence
+    clock.tick(11 * 60)
     eng.on_new_measurement(ts + 20, 800)
     assert len(calls) == 2
 
 
-def test_locked_session_blocks_notifications(monkeypatch):
-    eng, calls = make_engine(monkeypatch)
-    # Simulate locked by swapping session method
-    eng._session.is_unlocked = lambda: False
-    eng.on_new_measurement(int(datetime.now().timestamp()), 800)
+def test_lock_reset_creates_new_timewindow_even_if_later_short_lock(store_db):
+    # One old seated measurement before any locks (simulates no samples while locked)
+    store_db.save_measurement(BASE_TS - 5000, 800)  # seated height below threshold
+
+    # A long lock/unlock pair earlier than a later short pair, written in one transaction:
+    # long pair: 5 minutes lock (meets threshold); short pair: 30 seconds lock (below threshold)
+    store_db.save_session_events(
+        [(BASE_TS - 600, "LOCK"), (BASE_TS - 300, "UNLOCK"), (BASE_TS - 60, "LOCK"), (BASE_TS - 30, "UNLOCK")]
+    )
+
+    # Build engine with 5 minute reset threshold
+    cfg = SimpleNamespace(stand_threshold_mm=900, lock_reset_threshold_minutes=5)
+    sess = DummySession(unlocked=True)
+    eng = reminder.ReminderEngine(cfg, sess)
+
+    # Latest height is seated; seated streak should reset at the long UNLOCK (BASE_TS - 300)
+    seated_min = eng._compute_seated_streak_minutes(BASE_TS, latest_height=800)
+    assert seated_min == 5, f"Expected 5 minutes since last long unlock, got {seated_min}"
+
+
+def test_seated_reminder_from_stored_samples(store_db, engine_factory):
+    # Real streak computation: no stubs, the streak comes from the database
+    eng, calls = engine_factory(remind_after_minutes=30, seated_streak_fn=None, standing_streak_fn=None)
+    store_db.save_measurements([(BASE_TS - 45 * 60, 800), (BASE_TS, 800)])
+    # A 1 minute lock is below the 5 minute reset threshold
+    store_db.save_session_events([(BASE_TS - 40 * 60, "LOCK"), (BASE_TS - 39 * 60, "UNLOCK")])
+    eng.on_new_measurement(BASE_TS, 800)
+    assert calls == [("Stand up", "You've been seated for 45 min.")]
+
+
+def test_minutes_until_due_tracks_current_posture(engine_factory):
+    eng, _ = engine_factory(remind_after_minutes=90, standing_check_after_minutes=30)
+    assert eng.minutes_until_due() is None
+    eng.on_new_measurement(BASE_TS, 800)  # seated streak stubbed to 60
+    assert eng.minutes_until_due() == 30
+    eng.on_new_measurement(BASE_TS, 1000)  # standing streak stubbed to 0
+    assert eng.minutes_until_due() == 30
+
+
+def test_update_config_applies_new_thresholds(engine_factory):
+    eng, calls = engine_factory(remind_after_minutes=90)
+    eng.on_new_measurement(BASE_TS, 800)  # seated streak stubbed to 60
     assert calls == []
+    eng.update_config(SimpleNamespace(stand_threshold_mm=900, remind_after_minutes=45))
+    eng.on_new_measurement(BASE_TS, 800)
+    assert calls and calls[0][0] == "Stand up"
 
 
-def test_lock_reset_creates_new_timewindow_even_if_later_short_lock(monkeypatch, tmp_path):
-    # Use a temp DB
-    from deskcoach.models import store as mstore
+def test_streaks_start_at_first_sample_after_posture_change(store_db):
+    store_db.save_measurements(
+        (BASE_TS + offset, height)
+        for offset, height in ((-3600, 800), (-1800, 1000), (-1200, 1000), (-900, 800), (-600, 800), (600, 1000))
+    )
 
-    dbfile = tmp_path / "deskcoach.db"
-    monkeypatch.setattr(mstore, "db_path", lambda: dbfile)
-    mstore.init_db()
+    eng = reminder.ReminderEngine(SimpleNamespace(stand_threshold_mm=900), DummySession())
+    # Seated since BASE_TS - 900; the later standing sample is in the future
+    assert eng._compute_seated_streak_minutes(BASE_TS, latest_height=800) == 15
+    # Before the seated sample at -900, the standing run started at -1800
+    assert eng._compute_standing_streak_minutes(BASE_TS - 1000, latest_height=1000) == 13
 
-    # Fixed reference time to avoid flakiness
-    base_now = int(datetime(2025, 1, 1, 12, 0, 0).timestamp())
 
-    # One old seated measurement before any locks (simulates no samples while locked)
-    mstore.save_measurement(base_now - 5000, 800)  # seated height below threshold
+def test_long_unlock_lookup_cached_until_session_event(store_db):
+    store_db.save_session_events([(BASE_TS - 900, "LOCK"), (BASE_TS - 600, "UNLOCK")])
 
-    # A long lock/unlock pair earlier than a later short pair
-    # Long pair: 5 minutes lock (meets threshold)
-    mstore.save_session_event(base_now - 600, "LOCK")
-    mstore.save_session_event(base_now - 300, "UNLOCK")
+    eng = reminder.ReminderEngine(SimpleNamespace(stand_threshold_mm=900), DummySession())
+    assert eng._last_long_lock_unlock_ts(5) == BASE_TS - 600
+    store_db.save_session_events([(BASE_TS - 400, "LOCK"), (BASE_TS - 60, "UNLOCK")])
+    assert eng._last_long_lock_unlock_ts(5) == BASE_TS - 600  # cached
+    eng._on_unlocked()
+    assert eng._last_long_lock_unlock_ts(5) == BASE_TS - 60
 
-    # Short pair: 30 seconds lock (below threshold)
-    mstore.save_session_event(base_now - 60, "LOCK")
-    mstore.save_session_event(base_now - 30, "UNLOCK")
 
-    # Build engine with 5 minute reset threshold
-    cfg = SimpleNamespace(stand_threshold_mm=900, lock_reset_threshold_minutes=5)
-    sess = DummySession(unlocked=True)
-    eng = reminder.ReminderEngine(cfg, sess)
+def test_streak_query_skipped_while_posture_unchanged(monkeypatch):
+    eng = reminder.ReminderEngine(SimpleNamespace(stand_threshold_mm=900), DummySession())
+    queries = []
 
-    # Latest height is seated; seated streak should reset at the long UNLOCK (base_now - 300)
-    seated_min = eng._compute_seated_streak_minutes(base_now, latest_height=800)
-    assert seated_min == 5, f"Expected 5 minutes since last long unlock, got {seated_min}"
+    def fake_bounds(now_ts):
+        queries.append(now_ts)
+        return 1000, 500
+
+    monkeypatch.setattr(eng, "_streak_bounds", fake_bounds)
+    monkeypatch.setattr(eng, "_last_long_lock_unlock_ts", lambda minutes: None)
+    assert eng._compute_seated_streak_minutes(1600, 800) == 10
+    assert eng._compute_seated_streak_minutes(2200, 800) == 20
+    assert len(queries) == 1
+    assert eng._compute_standing_streak_minutes(2260, 1000) == 29  # posture changed: query again
+    assert len(queries) == 2
+
+
+def test_prefetch_caches_lookups_unless_dropped_meanwhile(monkeypatch):
+    eng = reminder.ReminderEngine(SimpleNamespace(stand_threshold_mm=900), DummySession())
+    queries = []
+    monkeypatch.setattr(eng, "_streak_bounds", lambda now_ts: queries.append(now_ts) or (1000, 500))
+    monkeypatch.setattr(eng, "_last_long_lock_unlock_ts", lambda minutes: None)
+    eng.prefetch(1600, 800)
+    assert eng._compute_seated_streak_minutes(1600, 800) == 10
+    assert len(queries) == 1
+
+    # A lock arriving while the worker's lookup runs keeps the stale result out of the cache
+    def bounds_with_lock(now_ts):
+        eng._on_locked()
+        return 1000, 500
+
+    monkeypatch.setattr(eng, "_streak_bounds", bounds_with_lock)
+    eng.prefetch(1700, 1000)
+    assert eng._run_start is None
+
+
+def test_samples_in_quick_succession_are_evaluated_once(engine_factory):
+    seen = []
+    eng, _ = engine_factory(
+        remind_after_minutes=1, remind_repeat_minutes=1, seated_streak_fn=lambda ts, h: seen.append(ts) or 60
+    )
+    ts = BASE_TS
+    eng.on_new_measurement(ts, 800)
+    eng.on_new_measurement(ts + 10, 800)  # same posture within the window: skipped
+    eng.on_new_measurement(ts + 12, 1000)  # posture changed: evaluated
+    eng.on_new_measurement(ts + 30, 1000)
+    assert seen == [ts, ts + 12, ts + 30]
+
+
+def test_streak_queries_seek_indexes(store_db):
+    # Both lookups run on every posture change; neither may scan a whole table
+    conn = store_db.read_connection()
+    queries = (
+        (reminder._long_unlock_sql, {"unlock": store_db.EVENT_UNLOCK, "lock": store_db.EVENT_LOCK, "lock_sec": 300}),
+        (reminder._streak_bounds_sql, {"now": BASE_TS, "thr": 900}),
+    )
+    for sql, params in queries:
+        details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+        scanned = {d.split()[1] for d in details if d.startswith("SCAN ")}
+        assert not scanned & {"session_events", "u", "l", "measurements"}
+        assert any("INDEX idx_session_events_event_ts" in d or "PRIMARY KEY" in d for d in details)
@@ -543,8 +543,8 @@ def test_persistence_events_monotonic_timestamps(sw, monkeypatch):
 
     class FakeStore:
         @staticmethod
-        def save_session_event(ts, evt):
-            saved.append((ts, evt))
+        def save_session_events(events):
+            saved.extend(events)
 
     monkeypatch.setattr(sw, "store", FakeStore, raising=False)
     # Start unlocked and cause a sequence
@@ -668,3 +668,21 @@ def test_registration_failure_logs_warning_message(sw, monkeypatch, caplog):
     with caplog.at_level("WARNING"):
         _ = sw.SessionWatcher()
     assert any("WTSRegisterSessionNotification failed" in rec.message for rec in caplog.records)
+
+
+def test_persistence_batches_queued_events(sw, monkeypatch):
+    batches = []
+
+    class FakeStore:
+        @staticmethod
+        def save_session_events(events):
+            batches.append(list(events))
+
+    monkeypatch.setattr(sw, "store", FakeStore, raising=False)
+    w = make_watcher(monkeypatch, platform="win32", wts_available=True, wts_probe=True)
+    # Events queued before the flush runs are written together
+    w._pending_events.append((1, "LOCK"))
+    w._persist_event(2, "UNLOCK")
+    assert batches == []
+    w.flush_events()
+    assert batches == [[(1, "LOCK"), (2, "UNLOCK")]]
@@ -4,17 +4,13 @@ import sqlite3
 from datetime import datetime
 
 
-def test_update_aggregate_uses_configured_day_start(tmp_path, monkeypatch):
-    from deskcoach.models import store
-
-    dbfile = tmp_path / "deskcoach.db"
-    monkeypatch.setattr(store, "db_path", lambda: dbfile)
-    store.init_db()
+def test_update_aggregate_uses_configured_day_start(store_db):
+    dbfile = store_db.db_path()
 
     now = int(datetime(2025, 1, 2, 3, 30, 0).timestamp())
-    store.save_measurement(now - 300, 800)
+    store_db.save_measurement(now - 300, 800)
 
-    store.update_daily_aggregates_now(
+    store_db.update_daily_aggregates_now(
         stand_threshold_mm=900,
         now_ts=now,
         start_of_day_hour=4,
@@ -36,3 +32,43 @@ def test_day_bounds_roll_to_previous_date_before_start_hour():
     assert date_str == "2025-01-01"
     assert start_dt.hour == 4
     assert start_dt.day == 1
+
+
+def _reference_day_bounds(ts, start_hour):
+    """datetime-based day start, as the store computed it before the integer fast path."""
+    from datetime import timedelta
+
+    base = datetime.fromtimestamp(ts)
+    start = base.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+    if base < start:
+        start = start - timedelta(days=1)
+    return int(start.timestamp()), start.strftime("%Y-%m-%d")
+
+
+def test_day_bounds_match_datetime_across_dst_changes(monkeypatch):
+    import time
+
+    import pytest
+
+    from deskcoach.models import store
+
+    if not hasattr(time, "tzset"):
+        pytest.skip("needs time.tzset")
+    # Spring-forward and fall-back days, including Santiago's midnight transitions
+    cases = {
+        "Europe/Zurich": ((2025, 3, 30), (2025, 10, 26)),
+        "America/New_York": ((2025, 3, 9), (2025, 11, 2)),
+        "America/Santiago": ((2025, 4, 6), (2025, 9, 7)),
+    }
+    try:
+        for tz, days in cases.items():
+            monkeypatch.setenv("TZ", tz)
+            time.tzset()
+            for y, m, d in days:
+                noon = int(datetime(y, m, d, 12).timestamp())
+                for ts in range(noon - 36 * 3600, noon + 36 * 3600, 900):
+                    for hour in (0, 1, 2, 3, 4, 23):
+                        assert store._day_bounds_local(ts, hour) == _reference_day_bounds(ts, hour), (tz, ts, hour)
+    finally:
+        monkeypatch.undo()
+        time.tzset()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import random
+
+
+def _reference_intervals(before, events, start_ts, end_ts):
+    """Straightforward state machine over (ts, 'LOCK'|'UNLOCK') events."""
+    locked = bool(before) and before[-1][1] == "LOCK"
+    lock_start = start_ts if locked else None
+    out = []
+    for ts, ev in events:
+        if ev == "LOCK" and not locked:
+            locked, lock_start = True, ts
+        elif ev == "UNLOCK" and locked:
+            if ts > lock_start:
+                out.append((lock_start, ts))
+            locked, lock_start = False, None
+    if locked and end_ts > lock_start:
+        out.append((lock_start, end_ts))
+    return out
+
+
+def test_locked_intervals_handles_repeats_and_boundaries(store_db):
+    for ts, ev in [(50, "LOCK"), (150, "UNLOCK"), (160, "UNLOCK"), (200, "LOCK"), (210, "LOCK"), (300, "UNLOCK"), (900, "LOCK")]:
+        store_db.save_session_event(ts, ev)
+
+    # Starts locked (LOCK at 50), duplicate UNLOCK/LOCK ignored, trailing lock runs to the end
+    assert store_db._locked_intervals(100, 1_000) == [(100, 150), (200, 300), (900, 1_000)]
+    assert store_db._locked_intervals(150, 250) == [(200, 250)]
+    assert store_db._locked_intervals(400, 800) == []
+
+
+def test_locked_intervals_match_reference(store_db):
+    rng = random.Random(7)
+    events = sorted({rng.randrange(0, 10_000): rng.choice(["LOCK", "UNLOCK"]) for _ in range(300)}.items())
+    for ts, ev in events:
+        store_db.save_session_event(ts, ev)
+
+    for _ in range(50):
+        start_ts = rng.randrange(0, 9_000)
+        end_ts = start_ts + rng.randrange(1, 3_000)
+        before = [e for e in events if e[0] <= start_ts]
+        inside = [e for e in events if start_ts < e[0] <= end_ts]
+        assert store_db._locked_intervals(start_ts, end_ts) == _reference_intervals(before, inside, start_ts, end_ts)
+
+
+def test_unlocked_window_sql_matches_python_attribution(store_db):
+    from deskcoach.utils.time_stats import accumulate_sit_stand_seconds
+
+    rng = random.Random(11)
+    ts = 1_000
+    rows = []
+    for _ in range(400):
+        ts += rng.choice([30, 60, 60, 120, 1_200])  # includes gaps beyond the 900 s cap
+        rows.append((ts, rng.choice([700, 899, 900, 1_100])))
+    for row in rows:
+        store_db.save_measurement(*row)
+
+    for _ in range(30):
+        start_ts = rng.randrange(0, ts)
+        end_ts = start_ts + rng.randrange(1, 20_000)
+        window = [r for r in rows if start_ts <= r[0] <= end_ts]
+        expected = accumulate_sit_stand_seconds(window, [], 900, end_ts)
+        assert store_db.compute_day_aggregates(start_ts, end_ts, 900) == expected
+
+
+def test_today_checkpoint_matches_full_recompute(store_db):
+    rng = random.Random(3)
+    day_start, ts = 100_000, 100_000
+    for step in range(120):
+        ts += rng.choice([45, 60, 60, 90, 1_000])
+        store_db.save_measurement(ts, rng.choice([750, 1_050]))
+        if step % 17 == 5:
+            store_db.save_session_event(ts + 10, "LOCK")
+            store_db.save_session_event(ts + rng.randrange(20, 400), "UNLOCK")
+        now = ts + rng.randrange(0, 50)
+        assert store_db._compute_today(day_start, now, 900) == store_db.compute_day_aggregates(day_start, now, 900)
+
+
+def test_backfill_matches_per_day_computation(store_db):
+    from datetime import datetime, timedelta
+
+    rng = random.Random(5)
+    first = datetime(2025, 3, 1, 6, 0, 0)
+    ts = int(first.timestamp())
+    end = int((first + timedelta(days=5)).timestamp())
+    while ts < end:
+        ts += rng.choice([60, 60, 300, 3_600])
+        store_db.save_measurement(ts, rng.choice([720, 1_080]))
+        if rng.random() < 0.02:
+            store_db.save_session_event(ts + 5, "LOCK")
+            store_db.save_session_event(ts + rng.randrange(60, 20_000), "UNLOCK")
+    store_db.upsert_daily_aggregate("2025-03-02", 1, 2, 0)  # existing rows are left alone
+
+    now = int(datetime(2025, 3, 6, 12, 0, 0).timestamp())
+    store_db.backfill_past_aggregates(900, upto_now_ts=now, start_of_day_hour=4)
+
+    assert store_db.get_aggregate_for_date("2025-03-02") == (1, 2)
+    for day in ("2025-03-01", "2025-03-03", "2025-03-04", "2025-03-05"):
+        expected = store_db.compute_full_day_aggregates_for_date(day, 900, start_of_day_hour=4)
+        assert store_db.get_aggregate_for_date(day) == expected
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import sqlite3
+
+
+def _count(dbfile) -> int:
+    with sqlite3.connect(dbfile) as conn:
+        return conn.execute("SELECT COUNT(*) FROM measurements").fetchone()[0]
+
+
+def test_each_measurement_is_committed_immediately(store_db):
+    dbfile = store_db.db_path()
+
+    # Visible to another connection right away: nothing is held back for a later batch
+    store_db.save_measurement(1_000, 800)
+    assert _count(dbfile) == 1
+    store_db.save_measurement(1_060, 810)
+    assert _count(dbfile) == 2
+
+
+def test_transaction_writes_measurement_and_event_together(store_db):
+    dbfile = store_db.db_path()
+
+    with store_db.transaction():
+        store_db.save_measurement(1_000, 800)
+        store_db.save_session_event(1_030, "LOCK")
+        assert _count(dbfile) == 0  # not committed yet
+    assert _count(dbfile) == 1
+    with sqlite3.connect(dbfile) as conn:
+        assert conn.execute("SELECT ts, event FROM session_events").fetchall() == [(1_030, store_db.EVENT_LOCK)]
+
+
+def test_save_session_events_writes_batch(store_db):
+    import pytest
+
+    dbfile = store_db.db_path()
+
+    store_db.save_session_events([(2_000, "LOCK"), (2_100, "unlock")])
+    with pytest.raises(ValueError):
+        store_db.save_session_events([(2_200, "LOCK"), (2_300, "SLEEP")])
+    with sqlite3.connect(dbfile) as conn:
+        rows = conn.execute("SELECT ts, event FROM session_events ORDER BY ts").fetchall()
+    assert rows == [(2_000, store_db.EVENT_LOCK), (2_100, store_db.EVENT_UNLOCK)]
+
+
+def test_save_measurements_writes_batch(store_db):
+    dbfile = store_db.db_path()
+
+    store_db.save_measurements([(1_000, 800), (1_060, 810), (1_120, 820)])
+    assert _count(dbfile) == 3
+
+
+def test_transaction_rolls_back_on_error(store_db):
+    import pytest
+
+    dbfile = store_db.db_path()
+
+    with pytest.raises(RuntimeError):
+        with store_db.transaction() as conn:
+            conn.execute(store_db._sesql, (1_000, store_db.EVENT_LOCK))
+            raise RuntimeError("boom")
+    with sqlite3.connect(dbfile) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM session_events").fetchone()[0] == 0
+
+
+def test_init_db_migrates_text_session_events(tmp_path, monkeypatch):
+    from deskcoach.models import store
+
+    dbfile = tmp_path / "deskcoach.db"
+    with sqlite3.connect(dbfile) as conn:
+        conn.execute(
+            "CREATE TABLE session_events (ts INTEGER NOT NULL, "
+            "event TEXT NOT NULL CHECK (event IN ('LOCK','UNLOCK')))"
+        )
+        conn.executemany("INSERT INTO session_events VALUES (?, ?)", [(100, "LOCK"), (400, "UNLOCK")])
+    monkeypatch.setattr(store, "db_path", lambda: dbfile)
+    store.init_db()
+
+    with sqlite3.connect(dbfile) as conn:
+        rows = conn.execute("SELECT ts, event FROM session_events ORDER BY ts").fetchall()
+    assert rows == [(100, store.EVENT_LOCK), (400, store.EVENT_UNLOCK)]
+    assert store._locked_intervals(0, 1_000) == [(100, 400)]
+
+
+def test_init_db_skips_ddl_once_schema_is_current(tmp_path, monkeypatch):
+    from deskcoach.models import store
+
+    dbfile = tmp_path / "deskcoach.db"
+    monkeypatch.setattr(store, "db_path", lambda: dbfile)
+    store.init_db()
+    with sqlite3.connect(dbfile) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == store.SCHEMA_VERSION
+
+    statements = []
+    conn = store._get_conn(dbfile)
+    conn.set_trace_callback(statements.append)
+    try:
+        store.init_db()
+    finally:
+        conn.set_trace_callback(None)
+    assert not any("CREATE" in s for s in statements)
+
+
+def test_init_db_migrates_rowid_measurements(tmp_path, monkeypatch):
+    from deskcoach.models import store
+
+    dbfile = tmp_path / "deskcoach.db"
+    with sqlite3.connect(dbfile) as conn:
+        conn.execute("CREATE TABLE measurements (ts INTEGER NOT NULL, height_mm INTEGER NOT NULL)")
+        conn.execute("CREATE INDEX idx_measurements_ts ON measurements(ts)")
+        conn.executemany("INSERT INTO measurements VALUES (?, ?)", [(200, 900), (100, 800), (200, 950)])
+    monkeypatch.setattr(store, "db_path", lambda: dbfile)
+    store.init_db()
+
+    with sqlite3.connect(dbfile) as conn:
+        assert conn.execute("SELECT ts, height_mm FROM measurements ORDER BY ts").fetchall() == [(100, 800), (200, 950)]
+        indexes = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='measurements'").fetchall()
+        assert indexes == []
+
+
+def test_upsert_daily_aggregate_skips_unchanged_rows(store_db):
+    dbfile = store_db.db_path()
+
+    store_db.upsert_daily_aggregate("2025-01-01", 60, 30, 1_000)
+    store_db.upsert_daily_aggregate("2025-01-01", 60, 30, 2_000)  # no change: keeps updated_ts
+    with sqlite3.connect(dbfile) as conn:
+        assert conn.execute("SELECT updated_ts FROM daily_aggregates").fetchone()[0] == 1_000
+    store_db.upsert_daily_aggregate("2025-01-01", 90, 30, 3_000)
+    with sqlite3.connect(dbfile) as conn:
+        assert conn.execute("SELECT sitting_sec, updated_ts FROM daily_aggregates").fetchone() == (90, 3_000)
@@ -1,4 +1,11 @@
-from deskcoach.utils.time_stats import accumulate_sit_stand_seconds
+import random
+from array import array
+
+from deskcoach.utils.time_stats import (
+    accumulate_sit_stand_seconds,
+    accumulate_sit_stand_seconds_arrays,
+    canonicalize_locks,
+)
 
 
 def test_long_gap_between_samples_is_capped_default():
@@ -46,3 +53,72 @@ def test_lock_intervals_applied_within_capped_window():
     assert seated == 0
     assert standing == 900 - 300
 
+
+def _per_second_reference(measurements, locks, thr, end_ts, max_gap_sec=900):
+    # Attribute second by second: the owning sample is the last one at or before it
+    locked = {t for l0, l1 in locks for t in range(l0, l1)}
+    seated = standing = 0
+    for i, (t0, h0) in enumerate(measurements):
+        t1 = measurements[i + 1][0] if i + 1 < len(measurements) else end_ts
+        for t in range(t0, min(t1, t0 + max_gap_sec)):
+            if t not in locked:
+                if h0 >= thr:
+                    standing += 1
+                else:
+                    seated += 1
+    return seated, standing
+
+
+def test_overlapping_unordered_locks_match_per_second_reference():
+    rng = random.Random(5)
+    for _ in range(40):
+        t = 0
+        measurements = []
+        for _ in range(rng.randrange(1, 25)):
+            t += rng.choice([20, 60, 300, 1_200])
+            measurements.append((t, rng.choice([700, 900, 1_100])))
+        end_ts = t + rng.randrange(0, 2_000)
+        locks = []
+        for _ in range(rng.randrange(0, 8)):
+            l0 = rng.randrange(0, end_ts + 1)
+            locks.append((l0, l0 + rng.randrange(0, 1_500)))
+        rng.shuffle(locks)
+        expected = _per_second_reference(measurements, locks, 900, end_ts)
+        assert accumulate_sit_stand_seconds(measurements, locks, 900, end_ts) == expected
+
+
+def test_unsorted_measurements_match_per_second_reference():
+    # Out-of-order samples make the lock sweep seek backwards
+    rng = random.Random(11)
+    for _ in range(40):
+        measurements = [(rng.randrange(0, 5_000), rng.choice([700, 1_100])) for _ in range(rng.randrange(1, 15))]
+        end_ts = 5_000
+        locks = []
+        for _ in range(rng.randrange(0, 6)):
+            l0 = rng.randrange(0, end_ts)
+            locks.append((l0, l0 + rng.randrange(0, 1_000)))
+        expected = _per_second_reference(measurements, locks, 900, end_ts)
+        assert accumulate_sit_stand_seconds(measurements, locks, 900, end_ts) == expected
+
+
+def test_array_columns_match_tuple_rows():
+    t0 = 1_700_000_000
+    measurements = [(t0, 700), (t0 + 600, 1_100), (t0 + 700, 1_100), (t0 + 4_000, 700)]
+    locks = [(t0 + 650, t0 + 900), (t0 + 800, t0 + 1_000)]
+    end_ts = t0 + 4_500
+    columns = accumulate_sit_stand_seconds_arrays(
+        array("q", [m[0] for m in measurements]),
+        array("q", [m[1] for m in measurements]),
+        array("q", [l[0] for l in locks]),
+        array("q", [l[1] for l in locks]),
+        900,
+        end_ts,
+    )
+    assert columns == accumulate_sit_stand_seconds(measurements, locks, 900, end_ts)
+    assert columns == _per_second_reference(measurements, locks, 900, end_ts)
+
+
+def test_canonicalize_locks_merges_overlapping_and_touching():
+    locks = [(50, 60), (10, 20), (15, 30), (30, 40), (45, 45), (55, 58)]
+    assert canonicalize_locks(locks) == [(10, 40), (50, 60)]
+    assert canonicalize_locks([]) == []